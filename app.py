@@ -1,45 +1,324 @@
+from typing import Iterable, Iterator, Optional, Union
+
+from core.ast_combine import AbstractAstModelCombine
+from core.cache import ConversionCache
 from core.combine import AbstractModelCombine
+from core.const import OUTPUT_SUFFIXES
+from core.db_primitives import CoreModel, CoreSchema
+from core.incremental import (
+    Fragment,
+    FragmentPrinter,
+    FragmentStore,
+    model_fingerprints,
+)
+from core.formatting import format_chunks, format_source
+from core.instrumentation import Instrumentation, StageObserver
 from core.printers import ModulePrinter
-from core.utils import import_user_module, detect_orm
-from orms_tools import combines, model_printers, module_printers
+from core.utils import (
+    import_user_module,
+    detect_orm,
+    release_user_module,
+    write_output,
+)
+from orms_tools import (
+    ast_combines,
+    combines,
+    core_model_printers,
+    model_printers,
+    module_printers,
+)
+
+
+class Conversion:
+    """State of one conversion, so that App itself is shared by threads safely."""
+
+    __slots__ = (
+        "raw_input_module",
+        "input_orm",
+        "output_orm",
+        "safe_mode",
+        "verify",
+        "input_combine",
+        "output_combine",
+        "output_module_printer",
+        "instrumentation",
+    )
+
+    input_combine: Union[AbstractModelCombine, AbstractAstModelCombine]
+    output_combine: Optional[AbstractModelCombine]
+    output_module_printer: Optional[ModulePrinter]
+
+    def __init__(
+        self,
+        raw_input_module: str,
+        output_orm: str,
+        safe_mode=False,
+        verify=False,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        self.instrumentation = instrumentation or Instrumentation()
+        self.raw_input_module = raw_input_module
+        with self.stage("detect"):
+            self.input_orm = detect_orm(raw_input_module)
+        self.output_orm = output_orm
+        self.safe_mode = safe_mode
+        self.verify = verify
+        if safe_mode:
+            self.input_combine = ast_combines[self.input_orm]()
+        else:
+            self.input_combine = combines[self.input_orm]()
+        self.output_combine = None
+        self.output_module_printer = None
+
+    def stage(self, name: str, model: Optional[str] = None):
+        return self.instrumentation.stage(name, model)
+
+    def iter_printed(self, model_names: Iterable[str]) -> Iterator[str]:
+        return iter_printed(
+            self.instrumentation, self.output_module_printer, model_names
+        )
+
+
+def iter_printed(
+    instrumentation: Instrumentation,
+    module_printer: ModulePrinter,
+    model_names: Iterable[Optional[str]],
+) -> Iterator[str]:
+    """Module chunks with printing timed, the header first and then model by model."""
+    chunks = module_printer.iter_module()
+    if not instrumentation.observers:
+        yield from chunks
+        return
+    for name in [None, *model_names]:
+        with instrumentation.stage("print", name):
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+    yield from chunks
 
 
 class App:
-    """Core application class."""
+    """Core application class.
+
+    App holds configuration only, every conversion keeps its state in `Conversion`.
+    Observers get start and end events of conversion stages, see `core.instrumentation`.
+    """
 
-    input_combine: AbstractModelCombine
-    output_combine: AbstractModelCombine
-    output_module_printer: ModulePrinter
+    cache: Optional[ConversionCache]
+    fragments: Optional[FragmentStore]
+    instrumentation: Instrumentation
 
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        cache: Optional[ConversionCache] = None,
+        fragments: Optional[FragmentStore] = None,
+        observers: Iterable[StageObserver] = (),
+    ):
+        self.cache = cache
+        self.fragments = fragments
+        self.instrumentation = Instrumentation(observers)
 
-    def process(self, raw_input_module: str, output_orm: str):
-        input_orm = detect_orm(raw_input_module)
+    def process(
+        self, raw_input_module: str, output_orm: str, safe_mode=False, verify=False
+    ):
+        """Convert module source to another ORM.
 
-        self.input_combine = combines[input_orm]()
-        self.output_combine = combines[output_orm]()
-        self.output_model_printer = module_printers[output_orm]
+        Output models are printed straight from CoreModel. With `verify` they are
+        also built as ORM classes and printed by introspection, and any mismatch
+        between the two outputs is reported.
+
+        Outputs are looked up in `cache` first, verified conversions always run.
+        """
+        return "".join(
+            self.iter_process(raw_input_module, output_orm, safe_mode, verify)
+        )
+
+    def iter_process(
+        self, raw_input_module: str, output_orm: str, safe_mode=False, verify=False
+    ) -> Iterator[str]:
+        """Convert module source to another ORM, yield output model by model.
+
+        Output goes to `cache` while it is yielded, so only one model is held in memory.
+        """
+        if self.cache is None or verify:
+            yield from self.convert(raw_input_module, output_orm, safe_mode, verify)
+            return
+        key = self.cache.key(raw_input_module, output_orm, safe_mode=safe_mode)
+        output_raw_module = self.cache.get(key)
+        if output_raw_module is not None:
+            yield output_raw_module
+            return
+        with self.cache.writer(key) as cache_stream:
+            for chunk in self.convert(raw_input_module, output_orm, safe_mode):
+                cache_stream.write(chunk)
+                yield chunk
+
+    def process_to_file(
+        self,
+        raw_input_module: str,
+        output_orm: str,
+        output_file: str,
+        safe_mode=False,
+        verify=False,
+        format_output=True,
+    ):
+        """Convert module source and stream output to file, Python formatted with black."""
+        self.write(
+            output_file,
+            self.iter_process(raw_input_module, output_orm, safe_mode, verify),
+            format_output and self.output_suffix(output_orm) == ".py",
+        )
 
-        input_module = import_user_module(raw_input_module)
+    @staticmethod
+    def output_suffix(output_orm: str) -> str:
+        """File suffix of output, `.py` for ORM modules and `.sql` for DDL"""
+        suffix = OUTPUT_SUFFIXES.get(output_orm)
+        if suffix is None:
+            suffix = module_printers[output_orm].source_suffix
+        return suffix
+
+    def write(self, output_file: str, chunks: Iterable[str], format_output=True):
+        """Stream module chunks to file, formatted with black.
+
+        Chunks are printed and formatted lazily, so print and format stages run
+        inside write.
+        """
+        with self.instrumentation.stage("write"):
+            if format_output:
+                chunks = format_chunks(chunks, self.format_chunk)
+            write_output(output_file, chunks)
+
+    def format_chunk(self, source: str) -> str:
+        with self.instrumentation.stage("format"):
+            return format_source(source)
+
+    def extract(self, raw_input_module: str, safe_mode=False) -> CoreSchema:
+        """Core models of module source, to store as IR or compare schemas."""
+        conversion = Conversion(
+            raw_input_module, None, safe_mode, instrumentation=self.instrumentation
+        )
+        input_combine = conversion.input_combine
+        with conversion.stage("import"):
+            input_module = import_user_module(raw_input_module, safe_mode=safe_mode)
         if not input_module:
             exit("Unable to import module")
-        input_models = self.input_combine.retrieve_models_from_module(input_module)
-
-        core_models = [
-            self.input_combine.to_core_model(model) for model in input_models
-        ]
-        output_models = [
-            self.output_combine.from_core_model(model) for model in core_models
-        ]
-
-        output_models_printers = [
-            model_printers[output_orm](model) for model in output_models
-        ]
-        self.output_module_printer = module_printers[output_orm](
+        try:
+            with conversion.stage("retrieve"):
+                input_models = input_combine.retrieve_models_from_module(input_module)
+            try:
+                return CoreSchema(
+                    self.to_core_model(conversion, model) for model in input_models
+                )
+            finally:
+                input_combine.dispose_models(input_models)
+        finally:
+            release_user_module(input_module)
+
+    def print_core_models(
+        self, core_models: Iterable[CoreModel], output_orm: str
+    ) -> Iterator[str]:
+        """Print core models, e.g. loaded from IR, without importing any module."""
+        core_models = list(core_models)
+        module_printer = module_printers[output_orm](
+            *(core_model_printers[output_orm](model) for model in core_models)
+        )
+        return iter_printed(
+            self.instrumentation,
+            module_printer,
+            [model.tablename for model in core_models],
+        )
+
+    def convert(
+        self, raw_input_module: str, output_orm: str, safe_mode=False, verify=False
+    ) -> Iterator[str]:
+        """Convert module source to another ORM bypassing cache, printing is lazy.
+
+        With `fragments` store only models whose fingerprint changed are converted
+        and printed, the rest of module is reassembled from stored fragments.
+        """
+        conversion = Conversion(
+            raw_input_module, output_orm, safe_mode, verify, self.instrumentation
+        )
+        input_combine = conversion.input_combine
+        fingerprints = {}
+        if (
+            self.fragments is not None
+            and not verify
+            and module_printers[output_orm].supports_fragments
+        ):
+            fingerprints = model_fingerprints(raw_input_module, output_orm, safe_mode)
+
+        with conversion.stage("import"):
+            input_module = import_user_module(raw_input_module, safe_mode=safe_mode)
+        if not input_module:
+            exit("Unable to import module")
+        try:
+            with conversion.stage("retrieve"):
+                input_models = input_combine.retrieve_models_from_module(input_module)
+            model_names = [input_combine.model_name(model) for model in input_models]
+            keys = [
+                fingerprints.get(input_combine.model_name(model))
+                for model in input_models
+            ]
+            stored = [self.fragments.get_fragment(key) if key else None for key in keys]
+            try:
+                core_models = CoreSchema(
+                    self.to_core_model(conversion, model)
+                    for model, fragment in zip(input_models, stored)
+                    if fragment is None
+                )
+            finally:
+                input_combine.dispose_models(input_models)
+        finally:
+            release_user_module(input_module)
+
+        output_models_printers = []
+        core_models_iter = iter(core_models)
+        for key, fragment in zip(keys, stored):
+            if fragment is None:
+                printer = core_model_printers[output_orm](next(core_models_iter))
+                if not key:
+                    output_models_printers.append(printer)
+                    continue
+                fragment = Fragment(printer.print_model(), printer.get_import_types())
+                self.fragments.put_fragment(key, fragment)
+            output_models_printers.append(FragmentPrinter(fragment))
+        conversion.output_module_printer = module_printers[output_orm](
             *output_models_printers
         )
+        if not verify:
+            return conversion.iter_printed(model_names)
+
+        output_raw_module = "".join(conversion.iter_printed(model_names))
+        orm_raw_module = self.print_orm_models(conversion, core_models)
+        if orm_raw_module != output_raw_module:
+            print(
+                "Warning: verification failed, ORM printer output differs "
+                "from CoreModel printer output"
+            )
+        return iter([orm_raw_module])
+
+    @staticmethod
+    def to_core_model(conversion: Conversion, model):
+        input_combine = conversion.input_combine
+        with conversion.stage("to_core", input_combine.model_name(model)):
+            return input_combine.to_core_model(model)
 
-        output_raw_module = self.output_module_printer.print_module()
-        return output_raw_module
+    @staticmethod
+    def print_orm_models(conversion: Conversion, core_models) -> str:
+        """Build real ORM classes from core models and print them by introspection."""
+        output_orm = conversion.output_orm
+        conversion.output_combine = output_combine = combines[output_orm]()
+        try:
+            output_models = []
+            for model in core_models:
+                with conversion.stage("from_core", model.tablename):
+                    output_models.append(output_combine.from_core_model(model))
 
+            output_models_printers = [
+                model_printers[output_orm](model) for model in output_models
+            ]
+            return module_printers[output_orm](*output_models_printers).print_module()
+        finally:
+            output_combine.dispose()
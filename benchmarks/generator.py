@@ -0,0 +1,162 @@
+import random
+from typing import Dict, List, Optional
+
+DEFAULT_TYPE_MIX = {
+    "int": 4,
+    "str": 4,
+    "bool": 2,
+    "float": 1,
+    "decimal": 1,
+    "date": 1,
+    "datetime": 2,
+    "bytes": 1,
+}
+
+SA_TYPES = {
+    "int": "sa.Integer",
+    "str": "sa.String(length=32)",
+    "bool": "sa.Boolean",
+    "float": "sa.Float",
+    "decimal": "sa.DECIMAL(2, 10)",
+    "date": "sa.Date",
+    "datetime": "sa.DateTime",
+    "bytes": "sa.BINARY",
+}
+
+DJANGO_TYPES = {
+    "int": "models.IntegerField()",
+    "str": "models.CharField(max_length=32)",
+    "bool": "models.BooleanField(default=False)",
+    "float": "models.FloatField()",
+    "decimal": "models.DecimalField(max_digits=10, decimal_places=2)",
+    "date": "models.DateField()",
+    "datetime": "models.DateTimeField(auto_now=True)",
+    "bytes": "models.BinaryField()",
+}
+
+SA_HEADER = """import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+"""
+
+DJANGO_HEADER = """from django.db import models
+"""
+
+
+class ModelSpec:
+    """Generated model: its fields by type name, FK targets and unique groups."""
+
+    def __init__(self, index: int, fields: List[str], foreign_keys: List[int]):
+        self.index = index
+        self.fields = fields
+        self.foreign_keys = foreign_keys
+        self.unique_together: List[List[str]] = []
+
+    @property
+    def classname(self) -> str:
+        return f"Model{self.index}"
+
+    @property
+    def tablename(self) -> str:
+        return f"model_{self.index}"
+
+    def field_names(self) -> List[str]:
+        return [f"{type_name}_{i}" for i, type_name in enumerate(self.fields)]
+
+
+def generate_specs(
+    models: int,
+    fields: int = 8,
+    type_mix: Optional[Dict[str, int]] = None,
+    fk_density: float = 0.3,
+    unique_together_density: float = 0.1,
+    seed: int = 0,
+) -> List[ModelSpec]:
+    """Random schema: `fk_density` is share of models with FK to an earlier model,
+    `unique_together_density` is share of models with a unique together pair."""
+    rng = random.Random(seed)
+    type_mix = type_mix or DEFAULT_TYPE_MIX
+    type_names = list(type_mix)
+    weights = [type_mix[name] for name in type_names]
+    specs = []
+    for index in range(models):
+        foreign_keys = []
+        if index and rng.random() < fk_density:
+            foreign_keys.append(rng.randrange(index))
+        spec = ModelSpec(
+            index, rng.choices(type_names, weights, k=fields), foreign_keys
+        )
+        if fields > 1 and rng.random() < unique_together_density:
+            spec.unique_together.append(rng.sample(spec.field_names(), 2))
+        specs.append(spec)
+    return specs
+
+
+def render_sa(specs: List[ModelSpec]) -> str:
+    parts = [SA_HEADER]
+    for spec in specs:
+        lines = [
+            f"class {spec.classname}(Base):",
+            f'    """Generated model {spec.index}."""',
+            "",
+            f'    __tablename__ = "{spec.tablename}"',
+        ]
+        if spec.unique_together:
+            constraints = ", ".join(
+                "sa.UniqueConstraint({})".format(", ".join(f'"{n}"' for n in names))
+                for names in spec.unique_together
+            )
+            lines.append(f"    __table_args__ = ({constraints},)")
+        lines.append("")
+        lines.append("    id = sa.Column(sa.Integer, primary_key=True)")
+        for name, type_name in zip(spec.field_names(), spec.fields):
+            lines.append(f"    {name} = sa.Column({SA_TYPES[type_name]})")
+        for target in spec.foreign_keys:
+            lines.append(
+                f"    model_{target}_id = sa.Column("
+                f"sa.Integer, sa.ForeignKey(Model{target}.id), nullable=False)"
+            )
+        parts.append("\n\n" + "\n".join(lines) + "\n")
+    return "".join(parts)
+
+
+def render_django(specs: List[ModelSpec]) -> str:
+    parts = [DJANGO_HEADER]
+    for spec in specs:
+        lines = [
+            f"class {spec.classname}(models.Model):",
+            f'    """Generated model {spec.index}."""',
+            "",
+            "    class Meta:",
+            f'        db_table = "{spec.tablename}"',
+        ]
+        if spec.unique_together:
+            groups = ", ".join(
+                "({})".format(", ".join(f'"{n}"' for n in names))
+                for names in spec.unique_together
+            )
+            lines.append(f"        unique_together = ({groups},)")
+        lines.append("")
+        lines.append("    id = models.IntegerField(primary_key=True)")
+        for name, type_name in zip(spec.field_names(), spec.fields):
+            lines.append(f"    {name} = {DJANGO_TYPES[type_name]}")
+        for target in spec.foreign_keys:
+            lines.append(
+                f"    model_{target} = models.ForeignKey("
+                f'Model{target}, on_delete=models.DO_NOTHING, related_name="+")'
+            )
+        parts.append("\n\n" + "\n".join(lines) + "\n")
+    return "".join(parts)
+
+
+def generate_module(orm: str, models: int, **kwargs) -> str:
+    """Source of `sa` or `django` module with `models` generated models."""
+    specs = generate_specs(models, **kwargs)
+    if orm == "sa":
+        return render_sa(specs)
+    if orm == "django":
+        return render_django(specs)
+    raise NotImplementedError(f"No generator for {orm}")
@@ -0,0 +1,200 @@
+"""Time conversion stages on generated schemas and gate their scaling.
+
+Stages are timed by `App` observers, so the code users run is measured.
+Stage timings are best of `--repeat` runs and scaling is fitted over at least
+three sizes, a gate on fewer is not reproducible.
+
+    python -m benchmarks.run --sizes 10 100 1000 10000 --check benchmarks/baseline.json
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import math
+import os
+import sys
+import tempfile
+from typing import Dict, List, Sequence
+
+from app import App
+from benchmarks.generator import generate_module
+from user_interfaces.profiling import StageTotals
+
+STAGES = ("import", "retrieve", "to_core", "from_core", "print", "format", "write")
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+DEFAULT_REPEAT = 3
+MIN_CHECK_SIZES = 3
+SCENARIOS = (("sa", "django"), ("django", "sa"))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+
+def measure(source: str, output_orm: str, safe_mode=False) -> Dict[str, float]:
+    """Seconds spent in every stage of `App.process_to_file` on one module.
+
+    Printing and formatting are lazy and run inside write, so write is reported
+    without them. from_core runs on the verify path only, it is timed by a
+    second conversion with `verify`, which is not formatted.
+    """
+    totals = StageTotals()
+    verify_totals = StageTotals()
+    app = App(observers=[totals])
+    with tempfile.TemporaryDirectory() as directory:
+        output_file = os.path.join(directory, f"output{app.output_suffix(output_orm)}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            # garbage of previous runs would be collected on this run's time
+            gc.collect()
+            app.process_to_file(source, output_orm, output_file, safe_mode)
+            gc.collect()
+            App(observers=[verify_totals]).process(
+                source, output_orm, safe_mode, verify=True
+            )
+    timings = {name: totals.stages.get(name, {}).get("wall", 0.0) for name in STAGES}
+    timings["from_core"] = verify_totals.stages["from_core"]["wall"]
+    timings["write"] -= timings["print"] + timings["format"]
+    return timings
+
+
+def run(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeat=DEFAULT_REPEAT,
+    safe_mode=False,
+    **generator_kwargs,
+) -> Dict[str, Dict[int, Dict[str, float]]]:
+    """Best of `repeat` stage timings by scenario and model count."""
+    results = {}
+    for input_orm, output_orm in SCENARIOS:
+        scenario = f"{input_orm}->{output_orm}"
+        results[scenario] = {}
+        for size in sizes:
+            source = generate_module(input_orm, size, **generator_kwargs)
+            runs = [measure(source, output_orm, safe_mode) for _ in range(repeat)]
+            results[scenario][size] = {
+                name: min(timings[name] for timings in runs) for name in STAGES
+            }
+            print(
+                f"{scenario:>12} {size:>6} models: "
+                + " ".join(
+                    f"{name}={results[scenario][size][name]:.4f}s" for name in STAGES
+                ),
+                file=sys.stderr,
+            )
+    return results
+
+
+def scaling_exponents(timings_by_size: Dict[int, Dict[str, float]], min_size=100):
+    """Slope of log(time) over log(models) by stage, least squares.
+
+    1.0 is linear scaling, 2.0 quadratic. Sizes under `min_size` are skipped when
+    at least `MIN_CHECK_SIZES` bigger ones exist, their timings are mostly
+    constant overhead.
+    """
+    sizes = sorted(timings_by_size)
+    if len([size for size in sizes if size >= min_size]) >= MIN_CHECK_SIZES:
+        sizes = [size for size in sizes if size >= min_size]
+    exponents = {}
+    for name in STAGES:
+        points = [
+            (math.log(size), math.log(max(timings_by_size[size][name], 1e-6)))
+            for size in sizes
+        ]
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        spread = sum((x - mean_x) ** 2 for x, _ in points)
+        exponents[name] = (
+            sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+            if spread
+            else 0.0
+        )
+    return exponents
+
+
+def check(exponents: Dict[str, Dict[str, float]], baseline: Dict) -> List[str]:
+    """Stages whose scaling got worse than baseline by more than its tolerance."""
+    tolerance = baseline.get("tolerance", DEFAULT_TOLERANCE)
+    regressions = []
+    for scenario, stages in exponents.items():
+        for name, exponent in stages.items():
+            expected = baseline["exponents"].get(scenario, {}).get(name)
+            if expected is not None and exponent > expected + tolerance:
+                regressions.append(
+                    f"{scenario} {name}: scales as n^{exponent:.2f}, "
+                    f"baseline n^{expected:.2f}"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ORM Combine benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--fields", type=int, default=8)
+    parser.add_argument("--fk-density", type=float, default=0.3)
+    parser.add_argument("--unique-together-density", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--safe-mode", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=str, help="Write raw timings to file")
+    parser.add_argument(
+        "--check",
+        type=str,
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        help="Fail when stage scaling is worse than in baseline file",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        type=str,
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        help="Store measured scaling as new baseline",
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+    if (args.check or args.update_baseline) and len(set(args.sizes)) < MIN_CHECK_SIZES:
+        # a slope through two noisy points is not reproducible
+        parser.error(f"scaling needs at least {MIN_CHECK_SIZES} sizes")
+
+    results = run(
+        args.sizes,
+        repeat=args.repeat,
+        safe_mode=args.safe_mode,
+        fields=args.fields,
+        fk_density=args.fk_density,
+        unique_together_density=args.unique_together_density,
+        seed=args.seed,
+    )
+    exponents = {
+        scenario: scaling_exponents(timings) for scenario, timings in results.items()
+    }
+    for scenario, stages in exponents.items():
+        print(
+            f"{scenario}: "
+            + " ".join(f"{name}=n^{exponent:.2f}" for name, exponent in stages.items())
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"timings": results, "exponents": exponents}, f, indent=2)
+    if args.update_baseline:
+        with open(args.update_baseline, "w") as f:
+            json.dump(
+                {
+                    "sizes": args.sizes,
+                    "tolerance": args.tolerance,
+                    "exponents": exponents,
+                },
+                f,
+                indent=2,
+            )
+            f.write("\n")
+    if args.check:
+        with open(args.check) as f:
+            regressions = check(exponents, json.load(f))
+        for regression in regressions:
+            print(f"Scaling regression: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
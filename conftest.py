@@ -7,10 +7,12 @@ import pytest
 
 from core.db_primitives import CoreField, CoreModel
 from orms_tools import (
+    DjangoCoreModelPrinter,
     DjangoModelPrinter,
     DjangoModulePrinter,
     DjangoOrmModelCombine,
     SQLAlchemyModelCombine,
+    SqlAlchemyCoreModelPrinter,
     SqlAlchemyModelPrinter,
     SqlAlchemyModulePrinter,
 )
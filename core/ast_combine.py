@@ -0,0 +1,113 @@
+import ast
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from core.db_primitives import CoreField, CoreModel
+
+
+NOT_LITERAL = object()
+
+
+class AstModel:
+    """Model class declaration found in a parsed module."""
+
+    node: ast.ClassDef
+    models: Dict[str, "AstModel"]
+
+    def __init__(self, node: ast.ClassDef, models: Dict[str, "AstModel"]):
+        self.node = node
+        self.models = models
+
+    @property
+    def name(self) -> str:
+        return self.node.name
+
+    @property
+    def doc(self) -> Optional[str]:
+        return ast.get_docstring(self.node, clean=False)
+
+
+class AbstractAstModelCombine(ABC):
+    """Abstract combine reading models from source code without executing it."""
+
+    type_names: Dict[str, type]
+
+    @classmethod
+    @abstractmethod
+    def is_model(cls, node: ast.ClassDef, models: Dict[str, AstModel]) -> bool:
+        """Check class declaration is an ORM Model"""
+
+    @abstractmethod
+    def to_core_model(self, model: AstModel) -> CoreModel:
+        """Convert model declaration to CoreModel"""
+
+    @abstractmethod
+    def to_core_field(self, model: AstModel, name: str, call: ast.Call) -> CoreField:
+        """Convert field declaration to CoreField"""
+
+    @classmethod
+    def retrieve_models_from_module(cls, module: ast.Module) -> List[AstModel]:
+        """Retrieve model declarations from parsed module"""
+        models = {}
+        for node in module.body:
+            if isinstance(node, ast.ClassDef) and cls.is_model(node, models):
+                models[node.name] = AstModel(node, models)
+        return list(models.values())
+
+    @staticmethod
+    def model_name(model: AstModel) -> str:
+        """Name of model class as declared in user module"""
+        return model.name
+
+    @classmethod
+    def dispose_models(cls, models: List[AstModel]):
+        """Source reading registers nothing in ORM, so nothing to forget"""
+
+    @staticmethod
+    def dotted_name(node: ast.AST) -> Optional[str]:
+        """Render `a.b.c` style name or attribute access, None for anything else."""
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute):
+            value = AbstractAstModelCombine.dotted_name(node.value)
+            return f"{value}.{node.attr}" if value else None
+        return None
+
+    @classmethod
+    def short_name(cls, node: ast.AST) -> Optional[str]:
+        """Last part of dotted name: `sa.Integer` and `Integer` both give `Integer`."""
+        if isinstance(node, ast.Call):
+            node = node.func
+        name = cls.dotted_name(node)
+        return name.split(".")[-1] if name else None
+
+    @staticmethod
+    def literal(node: Optional[ast.AST], default=None):
+        """Evaluate literal expression, `NOT_LITERAL` if it needs code execution."""
+        if node is None:
+            return default
+        try:
+            return ast.literal_eval(node)
+        except (ValueError, TypeError, SyntaxError):
+            return NOT_LITERAL
+
+    @staticmethod
+    def keywords(call: ast.Call) -> Dict[str, ast.AST]:
+        return {kw.arg: kw.value for kw in call.keywords if kw.arg}
+
+    @staticmethod
+    def assignments(node: ast.ClassDef):
+        """Yield (name, value) pairs of simple assignments in class body."""
+        for statement in node.body:
+            if isinstance(statement, ast.Assign):
+                if len(statement.targets) != 1:
+                    continue
+                target = statement.targets[0]
+                value = statement.value
+            elif isinstance(statement, ast.AnnAssign) and statement.value:
+                target = statement.target
+                value = statement.value
+            else:
+                continue
+            if isinstance(target, ast.Name):
+                yield target.id, value
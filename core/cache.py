@@ -0,0 +1,126 @@
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional, TextIO
+
+from core.const import ORMC_VERSION
+
+DEFAULT_CACHE_SIZE = 1000
+
+
+def default_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "ormc")
+
+
+class ConversionCache:
+    """On-disk conversion outputs addressed by hash of input, target ORM and ormc version.
+
+    Each entry is a file named after its key. Reading an entry touches its mtime,
+    so once there are more than `max_entries` files the least recently used go first.
+    """
+
+    suffix = ".py"
+
+    directory: str
+    max_entries: int
+    hits: int
+    misses: int
+    entry_count: Optional[int]
+
+    def __init__(self, directory: Optional[str] = None, max_entries=DEFAULT_CACHE_SIZE):
+        self.directory = directory or default_cache_dir()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.entry_count = None
+
+    @staticmethod
+    def key(raw_input_module: str, output_orm: str, safe_mode=False) -> str:
+        digest = hashlib.sha256()
+        for part in (ORMC_VERSION, output_orm, "safe" if safe_mode else "exec"):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        digest.update(raw_input_module.encode())
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def get(self, key: str) -> Optional[str]:
+        """Stored output of conversion, or None on miss"""
+        path = self.path(key)
+        try:
+            with open(path) as f:
+                output = f.read()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return output
+
+    def put(self, key: str, output: str):
+        """Store conversion output and evict least recently used entries"""
+        with self.writer(key) as f:
+            f.write(output)
+
+    @contextmanager
+    def writer(self, key: str) -> Iterator[TextIO]:
+        """Stream to write conversion output to, stored only if block completes"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        is_new = not os.path.exists(path)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                yield f
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        if self.entry_count is not None and is_new:
+            self.entry_count += 1
+        if self.entry_count is None or self.entry_count > self.max_entries:
+            self.evict()
+
+    def entries(self):
+        """(mtime, path) of stored outputs"""
+        entries = []
+        with os.scandir(self.directory) as dir_entries:
+            for entry in dir_entries:
+                if not entry.name.endswith(self.suffix):
+                    continue
+                try:
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+                except FileNotFoundError:
+                    continue
+        return entries
+
+    def evict(self):
+        entries = self.entries()
+        self.entry_count = min(len(entries), self.max_entries)
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[: len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        self.entry_count = None
+        if not os.path.isdir(self.directory):
+            return
+        for _, path in self.entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> str:
+        return f"Cache: {self.hits} hits, {self.misses} misses"
@@ -2,17 +2,16 @@ from abc import ABC, abstractmethod
 from datetime import date as date_type
 from datetime import datetime as datetime_type
 from decimal import Decimal
-from typing import Dict, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
 
 
 class AbstractModelCombine(ABC):
     """Abstract Model Combine."""
-    fields: list = []
-    foreign_keys: list
-    primary_keys: list
-    constraints: list
 
     type_map: Dict
+    core_types: Mapping[type, type] = MappingProxyType({})
 
     def __init__(self):
 
@@ -27,6 +26,16 @@ class AbstractModelCombine(ABC):
             bytes: self.bytes,
         }
 
+    @classmethod
+    @lru_cache(maxsize=None)
+    def resolve_core_type(cls, orm_type: type) -> Optional[type]:
+        """Core type of ORM field or column type class, looked up along its MRO"""
+        for klass in orm_type.__mro__:
+            core_type = cls.core_types.get(klass)
+            if core_type is not None:
+                return core_type
+        return None
+
     @classmethod
     @abstractmethod
     def is_model(cls, model):
@@ -74,7 +83,7 @@ class AbstractModelCombine(ABC):
 
     @staticmethod
     @abstractmethod
-    def get_fields(self, model):
+    def get_fields(model):
         """Get fields from model"""
 
     @staticmethod
@@ -101,3 +110,15 @@ class AbstractModelCombine(ABC):
     def retrieve_models_from_module(cls, module) -> List:
         """Retrieve models from module"""
         return [model for model in module.__dict__.values() if cls.is_model(model)]
+
+    @staticmethod
+    def model_name(model) -> str:
+        """Name of model class as declared in user module"""
+        return model.__name__
+
+    def dispose(self):
+        """Release ORM state of models built by this combine"""
+
+    @classmethod
+    def dispose_models(cls, models: List):
+        """Forget ORM registrations of models retrieved from user module"""
@@ -1,3 +1,26 @@
-import pytest
+import datetime
+from decimal import Decimal
+
+ORMC_VERSION = "0.1.0"
 
 SUPPORTED_ORMS = ("sa", "django")
+
+DDL_TARGETS = ("ddl-sqlite", "ddl-postgresql")
+
+# known without importing output printers, third-party ones are asked
+OUTPUT_SUFFIXES = {
+    **{orm: ".py" for orm in SUPPORTED_ORMS},
+    **{target: ".sql" for target in DDL_TARGETS},
+}
+
+SQL_TYPES = {
+    "int": int,
+    "str": str,
+    "bool": bool,
+    "float": float,
+    "decimal": Decimal,
+    "date": datetime.date,
+    "datetime": datetime.datetime,
+    "bytes": bytes,
+}
+SQL_TYPE_NAMES = {sql_type: name for name, sql_type in SQL_TYPES.items()}
@@ -1,8 +1,34 @@
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 class CoreField:
     """Core Field."""
+
+    __slots__ = (
+        "sql_type",
+        "name",
+        "doc",
+        "primary_key",
+        "foreign_key",
+        "nullable",
+        "unique",
+        "default",
+        "table_related",
+        "length",
+        "precision",
+        "scale",
+        "auto_on_create",
+        "auto_on_update",
+    )
+
+    spec_param_names = (
+        "length",
+        "precision",
+        "scale",
+        "auto_on_create",
+        "auto_on_update",
+    )
+
     sql_type: type
     name: str
     doc: Optional[str]
@@ -11,6 +37,11 @@ class CoreField:
     nullable: Optional[bool]
     unique: Optional[bool]
     table_related: Optional[str]
+    length: Optional[int]
+    precision: Optional[int]
+    scale: Optional[int]
+    auto_on_create: bool
+    auto_on_update: bool
 
     def __init__(
         self,
@@ -23,7 +54,11 @@ class CoreField:
         unique=False,
         default=None,
         table_related=None,
-        **kwargs
+        length: Optional[int] = None,
+        precision: Optional[int] = None,
+        scale: Optional[int] = None,
+        auto_on_create: bool = False,
+        auto_on_update: bool = False,
     ):
 
         self.sql_type = sql_type
@@ -41,17 +76,53 @@ class CoreField:
             self.unique = unique
 
         self.table_related = table_related
-        self.spec_params = kwargs
+        self.length = length
+        self.precision = precision
+        self.scale = scale
+        self.auto_on_create = auto_on_create
+        self.auto_on_update = auto_on_update
+
+    @property
+    def spec_params(self) -> Dict:
+        """Type specific params which are set, as keyword arguments"""
+        params = {}
+        for name in self.spec_param_names:
+            value = getattr(self, name)
+            if value is not None and value is not False:
+                params[name] = value
+        return params
+
+    @property
+    def foreign_key_target(self) -> Optional[Tuple[str, str]]:
+        """(table name, column name) pair of foreign key"""
+        if not self.foreign_key:
+            return None
+        tablename, _, column = self.foreign_key.lower().partition(".")
+        return tablename, column
 
 
 class CoreModel:
     """Core Model."""
+
+    __slots__ = (
+        "tablename",
+        "fields",
+        "fields_by_name",
+        "doc",
+        "unique_together",
+        "name",
+        "structure_hash",
+    )
+
     tablename: str
     fields: List[
         CoreField,
     ]
+    fields_by_name: Dict[str, CoreField]
     doc: str
     unique_together: Tuple[Tuple[str, ]]
+    name: Optional[str]
+    structure_hash: Optional[str]
 
     def __init__(
         self,
@@ -60,16 +131,87 @@ class CoreModel:
             CoreField,
         ],
         doc: str = "Generated By ORM Combine",
-        unique_together: Tuple[Tuple[str, ]] = ()
+        unique_together: Tuple[Tuple[str, ]] = (),
+        name: Optional[str] = None,
     ):
         self.tablename = tablename
         self.fields = fields
+        self.fields_by_name = {}
         for field in fields:
             field.table_related = self.tablename
-            setattr(self, field.name, field)
+            self.fields_by_name[field.name] = field
         self.doc = doc
         self.unique_together = unique_together
+        # class name model was declared with, foreign keys may refer to it
+        self.name = name
+        # set by `core.diff.model_hash` on first use, models are not changed later
+        self.structure_hash = None
+
+    def __getattr__(self, name):
+        if name != "fields_by_name":
+            field = self.fields_by_name.get(name)
+            if field is not None:
+                return field
+        raise AttributeError(f"{type(self).__name__} has no field {name!r}")
 
     @property
     def __doc__(self):
         return self.doc
+
+    def get_field(self, name: str) -> Optional[CoreField]:
+        return self.fields_by_name.get(name)
+
+    def unique_together_fields(self) -> List[Tuple[CoreField, ...]]:
+        """Fields of every unique together group"""
+        return [
+            tuple(self.fields_by_name[name] for name in names)
+            for names in self.unique_together
+        ]
+
+
+class CoreSchema:
+    """Core models of one module, indexed by table and class name."""
+
+    __slots__ = ("models", "models_by_tablename", "models_by_name")
+
+    models: List[CoreModel]
+    models_by_tablename: Dict[str, CoreModel]
+    models_by_name: Dict[str, CoreModel]
+
+    def __init__(self, models: Iterable[CoreModel] = ()):
+        self.models = []
+        self.models_by_tablename = {}
+        self.models_by_name = {}
+        for model in models:
+            self.add(model)
+
+    def add(self, model: CoreModel):
+        self.models.append(model)
+        self.models_by_tablename[model.tablename.lower()] = model
+        if model.name:
+            self.models_by_name[model.name.lower()] = model
+
+    def __iter__(self):
+        return iter(self.models)
+
+    def __len__(self):
+        return len(self.models)
+
+    def get_model(self, tablename: str) -> Optional[CoreModel]:
+        return self.models_by_tablename.get(tablename.lower())
+
+    def resolve_foreign_key(
+        self, field: CoreField
+    ) -> Optional[Tuple[CoreModel, CoreField]]:
+        """(model, field) which foreign key of field points to, if in schema"""
+        target = field.foreign_key_target
+        if target is None:
+            return None
+        # foreign keys refer to table name or, like Django ones, to class name
+        model = self.get_model(target[0]) or self.models_by_name.get(target[0])
+        if model is None:
+            return None
+        target_field = model.get_field(target[1])
+        if target_field is None:
+            return None
+        return model, target_field
@@ -0,0 +1,158 @@
+"""Structural diff of two sets of core models.
+
+Every model is reduced to its structure (column types, nullability, uniqueness,
+keys and unique together, not docs or column order) and hashed once. The hash
+is kept on the model and stored in IR, so tables with equal hashes are skipped
+without building or comparing their structure.
+"""
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from core.db_primitives import CoreField, CoreModel
+from core.const import SQL_TYPE_NAMES
+
+ADD_TABLE = "add_table"
+DROP_TABLE = "drop_table"
+ADD_COLUMN = "add_column"
+DROP_COLUMN = "drop_column"
+ALTER_COLUMN = "alter_column"
+ADD_UNIQUE_TOGETHER = "add_unique_together"
+DROP_UNIQUE_TOGETHER = "drop_unique_together"
+
+COLUMN_ATTRIBUTES = ("type", "primary_key", "nullable", "unique", "foreign_key")
+
+
+class DiffOperation(NamedTuple):
+    """One change turning old schema into new one."""
+
+    op: str
+    table: str
+    column: Optional[str] = None
+    attribute: Optional[str] = None
+    old: Any = None
+    new: Any = None
+
+    def __str__(self):
+        target = f"{self.table}.{self.column}" if self.column else self.table
+        if self.op == ALTER_COLUMN:
+            return f"{self.op} {target} {self.attribute}: {self.old} -> {self.new}"
+        if self.op in (ADD_UNIQUE_TOGETHER, DROP_UNIQUE_TOGETHER):
+            return f"{self.op} {target} ({', '.join(self.new or self.old)})"
+        return f"{self.op} {target}"
+
+
+def column_type(field: CoreField) -> str:
+    """Type with its size, like `str(20)` or `decimal(2, 10)`"""
+    name = SQL_TYPE_NAMES.get(field.sql_type, getattr(field.sql_type, "__name__", ""))
+    params = [
+        str(value)
+        for value in (field.length, field.precision, field.scale)
+        if value is not None
+    ]
+    return f"{name}({', '.join(params)})" if params else name
+
+
+def column_structure(field: CoreField) -> Dict[str, Any]:
+    target = field.foreign_key_target
+    return {
+        "type": column_type(field),
+        "primary_key": bool(field.primary_key),
+        "nullable": bool(field.nullable),
+        "unique": bool(field.unique),
+        "foreign_key": ".".join(target) if target else None,
+    }
+
+
+class ModelStructure(NamedTuple):
+    columns: Dict[str, Dict]
+    unique_together: List[Tuple[str, ...]]
+
+
+def model_structure(model: CoreModel) -> ModelStructure:
+    columns = {field.name: column_structure(field) for field in model.fields}
+    unique_together = sorted(tuple(names) for names in model.unique_together)
+    return ModelStructure(columns, unique_together)
+
+
+def structure_hash(structure: ModelStructure) -> str:
+    data = json.dumps(list(structure), sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def hashed_structure(model: CoreModel) -> Tuple[str, Optional[ModelStructure]]:
+    """Hash of model and structure built to compute it, None when it was known"""
+    if model.structure_hash is not None:
+        return model.structure_hash, None
+    structure = model_structure(model)
+    model.structure_hash = structure_hash(structure)
+    return model.structure_hash, structure
+
+
+def model_hash(model: CoreModel) -> str:
+    """Hash of model structure, equal for models no operation tells apart.
+
+    Computed once per model, models are not changed after they are built.
+    """
+    return hashed_structure(model)[0]
+
+
+def diff_models(
+    old: CoreModel,
+    new: CoreModel,
+    old_structure: Optional[ModelStructure] = None,
+    new_structure: Optional[ModelStructure] = None,
+) -> Iterator[DiffOperation]:
+    """Column and unique together operations turning old model into new one"""
+    table = new.tablename
+    old_columns, old_unique_together = old_structure or model_structure(old)
+    new_columns, new_unique_together = new_structure or model_structure(new)
+    for name, structure in new_columns.items():
+        old_structure = old_columns.get(name)
+        if old_structure is None:
+            yield DiffOperation(ADD_COLUMN, table, name, new=structure)
+            continue
+        for attribute in COLUMN_ATTRIBUTES:
+            if old_structure[attribute] != structure[attribute]:
+                yield DiffOperation(
+                    ALTER_COLUMN,
+                    table,
+                    name,
+                    attribute,
+                    old_structure[attribute],
+                    structure[attribute],
+                )
+    for name, structure in old_columns.items():
+        if name not in new_columns:
+            yield DiffOperation(DROP_COLUMN, table, name, old=structure)
+    for names in new_unique_together:
+        if names not in old_unique_together:
+            yield DiffOperation(ADD_UNIQUE_TOGETHER, table, new=names)
+    for names in old_unique_together:
+        if names not in new_unique_together:
+            yield DiffOperation(DROP_UNIQUE_TOGETHER, table, old=names)
+
+
+def diff_schemas(
+    old: Iterable[CoreModel], new: Iterable[CoreModel]
+) -> Iterator[DiffOperation]:
+    """Operations turning old schema into new one, tables matched by name.
+
+    New and changed tables come in order of new schema, dropped ones last.
+    """
+    old_models = {model.tablename.lower(): model for model in old}
+    new_names = set()
+    for model in new:
+        name = model.tablename.lower()
+        new_names.add(name)
+        old_model = old_models.get(name)
+        if old_model is None:
+            yield DiffOperation(ADD_TABLE, model.tablename)
+            continue
+        old_hash, old_structure = hashed_structure(old_model)
+        new_hash, new_structure = hashed_structure(model)
+        if old_hash != new_hash:
+            yield from diff_models(old_model, model, old_structure, new_structure)
+    for name, model in old_models.items():
+        if name not in new_names:
+            yield DiffOperation(DROP_TABLE, model.tablename)
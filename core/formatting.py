@@ -0,0 +1,42 @@
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator
+
+
+@lru_cache(maxsize=None)
+def load_black():
+    """black module with Mode to reuse, or None when black is not installed."""
+    try:
+        import black
+    except ImportError:
+        return None
+    return black, black.Mode()
+
+
+def format_source(source: str) -> str:
+    """Format generated module with black in-process, as is without black."""
+    loaded = load_black()
+    if loaded is None:
+        return source
+    black, mode = loaded
+    try:
+        return black.format_str(source, mode=mode)
+    except black.InvalidInput:
+        return source
+
+
+def format_chunks(
+    chunks: Iterable[str], formatter: Callable[[str], str] = format_source
+) -> Iterator[str]:
+    """Format module streamed in top level chunks one by one, as black formats it whole.
+
+    `formatter` formats one chunk, `format_source` wrapped e.g. to time it.
+    """
+    if load_black() is None:
+        yield from chunks
+        return
+    separator = ""
+    for chunk in chunks:
+        formatted = formatter(chunk)
+        if formatted.strip():
+            yield separator + formatted
+            separator = "\n\n"
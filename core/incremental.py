@@ -0,0 +1,142 @@
+import ast
+import hashlib
+import json
+import os
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from core.cache import ConversionCache, default_cache_dir
+from core.const import ORMC_VERSION
+
+DEFAULT_FRAGMENT_STORE_SIZE = 50000
+
+
+class Fragment(NamedTuple):
+    """Printed model with the import types it needs."""
+
+    model: str
+    import_types: List[str]
+
+
+class FragmentPrinter:
+    """Model printer replaying stored fragment, for module printers."""
+
+    fragment: Fragment
+
+    def __init__(self, fragment: Fragment):
+        self.fragment = fragment
+
+    def print_model(self) -> str:
+        return self.fragment.model
+
+    def get_import_types(self) -> List[str]:
+        return list(self.fragment.import_types)
+
+
+class FragmentStore(ConversionCache):
+    """Printed models stored on disk by model fingerprint."""
+
+    suffix = ".json"
+
+    def __init__(
+        self, directory: Optional[str] = None, max_entries=DEFAULT_FRAGMENT_STORE_SIZE
+    ):
+        super().__init__(
+            directory or os.path.join(default_cache_dir(), "fragments"), max_entries
+        )
+
+    def get_fragment(self, key: str) -> Optional[Fragment]:
+        stored = self.get(key)
+        if stored is None:
+            return None
+        return Fragment(**json.loads(stored))
+
+    def put_fragment(self, key: str, fragment: Fragment):
+        self.put(key, json.dumps(fragment._asdict()))
+
+
+def class_identifiers(node: ast.ClassDef) -> Set[str]:
+    """Lowercased names other classes may refer to this class by: name and table name."""
+    identifiers = {node.name.lower()}
+    for statement in ast.walk(node):
+        if not isinstance(statement, ast.Assign):
+            continue
+        targets = {
+            target.id for target in statement.targets if isinstance(target, ast.Name)
+        }
+        if targets & {"__tablename__", "db_table"} and isinstance(
+            statement.value, ast.Constant
+        ):
+            if isinstance(statement.value.value, str):
+                identifiers.add(statement.value.value.lower())
+    return identifiers
+
+
+def class_references(node: ast.ClassDef) -> Set[str]:
+    """Lowercased names, attributes and string parts used in class declaration."""
+    references = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            references.add(child.id.lower())
+        elif isinstance(child, ast.Attribute):
+            references.add(child.attr.lower())
+        elif isinstance(child, ast.Constant) and isinstance(child.value, str):
+            references.update(part.lower() for part in child.value.split("."))
+    return references
+
+
+def model_fingerprints(
+    raw_input_module: str, output_orm: str, safe_mode=False
+) -> Dict[str, str]:
+    """Fingerprint of every top level class of module by class name.
+
+    Fingerprint covers class source, sources of classes it refers to (FK targets,
+    parents, ...) transitively, module level code outside of classes, target ORM
+    and ormc version. Unchanged fingerprint means unchanged printed model.
+    """
+    try:
+        module = ast.parse(raw_input_module)
+    except SyntaxError:
+        return {}
+
+    sources = {}
+    identifiers = {}
+    preamble = hashlib.sha256()
+    for part in (ORMC_VERSION, output_orm, "safe" if safe_mode else "exec"):
+        preamble.update(part.encode())
+        preamble.update(b"\0")
+    for node in module.body:
+        source = ast.get_source_segment(raw_input_module, node) or ""
+        if isinstance(node, ast.ClassDef):
+            sources[node.name] = source
+            for identifier in class_identifiers(node):
+                identifiers.setdefault(identifier, set()).add(node.name)
+        else:
+            preamble.update(source.encode())
+            preamble.update(b"\0")
+
+    dependencies = {}
+    for node in module.body:
+        if isinstance(node, ast.ClassDef):
+            dependencies[node.name] = {
+                name
+                for reference in class_references(node)
+                for name in identifiers.get(reference, ())
+                if name != node.name
+            }
+
+    fingerprints = {}
+    for name in sources:
+        closure = {name}
+        pending = [name]
+        while pending:
+            for dependency in dependencies[pending.pop()]:
+                if dependency not in closure:
+                    closure.add(dependency)
+                    pending.append(dependency)
+        digest = preamble.copy()
+        digest.update(name.encode())
+        for dependency in sorted(closure):
+            digest.update(b"\0")
+            digest.update(sources[dependency].encode())
+        fingerprints[name] = digest.hexdigest()
+    return fingerprints
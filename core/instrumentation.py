@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import IO, Iterable, List, NamedTuple, Optional
+
+STAGES = (
+    "detect",
+    "import",
+    "retrieve",
+    "to_core",
+    "from_core",
+    "print",
+    "format",
+    "write",
+)
+
+
+class StageEvent(NamedTuple):
+    """Start or end of conversion stage, for whole module or one model.
+
+    Durations, allocated (net) and peak traced bytes are set on end events only,
+    bytes only while tracemalloc is tracing. Peak is process-wide.
+    """
+
+    event: str
+    stage: str
+    model: Optional[str]
+    timestamp: float
+    wall: Optional[float] = None
+    cpu: Optional[float] = None
+    allocated: Optional[int] = None
+    peak: Optional[int] = None
+
+
+class StageObserver:
+    """Base observer, override the events you need. Observers may be called from many threads."""
+
+    def stage_started(self, event: StageEvent):
+        pass
+
+    def stage_finished(self, event: StageEvent):
+        pass
+
+
+class JsonLinesExporter(StageObserver):
+    """Write every stage event to stream as JSON line."""
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+        self.lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: str) -> "JsonLinesExporter":
+        return cls(open(path, "a"))
+
+    def export(self, event: StageEvent):
+        line = json.dumps(event._asdict())
+        with self.lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    stage_started = export
+    stage_finished = export
+
+    def close(self):
+        self.stream.close()
+
+
+class StageFrame:
+    __slots__ = ("started", "cpu_started", "memory_started", "peak")
+
+    def __init__(self, memory_started: Optional[int]):
+        self.started = time.perf_counter()
+        self.cpu_started = time.thread_time()
+        self.memory_started = memory_started
+        self.peak = memory_started or 0
+
+
+thread_stages = threading.local()
+
+
+def stage_frames() -> List[StageFrame]:
+    """Stages open in this thread, outer first"""
+    if not hasattr(thread_stages, "frames"):
+        thread_stages.frames = []
+    return thread_stages.frames
+
+
+class Instrumentation:
+    """Send stage events to observers. Nested stages are tracked per thread."""
+
+    observers: List[StageObserver]
+
+    def __init__(self, observers: Iterable[StageObserver] = ()):
+        self.observers = list(observers)
+
+    def stage(self, name: str, model: Optional[str] = None):
+        """Context manager timing stage, does nothing without observers"""
+        if not self.observers:
+            return nullcontext()
+        return self.observed_stage(name, model)
+
+    @contextmanager
+    def observed_stage(self, name: str, model: Optional[str]):
+        frames = stage_frames()
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if frames:
+                frames[-1].peak = max(frames[-1].peak, peak)
+            tracemalloc.reset_peak()
+        event = StageEvent("start", name, model, time.time())
+        for observer in self.observers:
+            observer.stage_started(event)
+        frame = StageFrame(current if tracing else None)
+        frames.append(frame)
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - frame.started
+            cpu = time.thread_time() - frame.cpu_started
+            frames.pop()
+            allocated = peak = None
+            if tracing and tracemalloc.is_tracing():
+                current, traced_peak = tracemalloc.get_traced_memory()
+                allocated = current - frame.memory_started
+                peak = max(frame.peak, traced_peak)
+                if frames:
+                    frames[-1].peak = max(frames[-1].peak, peak)
+            event = StageEvent(
+                "end", name, model, time.time(), wall, cpu, allocated, peak
+            )
+            for observer in self.observers:
+                observer.stage_finished(event)
@@ -0,0 +1,259 @@
+"""Schema IR: core models stored as a stream of records, one per model.
+
+First record is header `{"format": "ormc-ir", "version": 1}`, then one record per
+CoreModel. JSON lines are always supported, msgpack when it is installed. Files
+are told apart by their first byte, so readers need no format argument.
+
+Values JSON can not hold are tagged, like `{"$decimal": "1.10"}`, and field
+attributes equal to CoreField defaults are left out. Callable defaults are not
+stored, reading IR never imports anything: "now" defaults of dates are kept as
+`auto_on_create`, others are dropped with a warning.
+"""
+import base64
+import datetime
+import io
+import json
+import os
+import tempfile
+import warnings
+from decimal import Decimal
+from functools import lru_cache
+from typing import IO, Dict, Iterable, Iterator, Optional
+
+from core.const import SQL_TYPE_NAMES, SQL_TYPES
+from core.db_primitives import CoreField, CoreModel, CoreSchema
+from core.diff import model_hash
+from core.utils import file_mode
+
+IR_FORMAT = "ormc-ir"
+IR_VERSION = 1
+JSON = "json"
+MSGPACK = "msgpack"
+
+NOW_DEFAULTS = ("now", "utcnow", "today")
+
+FIELD_DEFAULTS = {
+    "doc": "",
+    "primary_key": False,
+    "foreign_key": None,
+    "nullable": True,
+    "unique": False,
+    "default": None,
+    "length": None,
+    "precision": None,
+    "scale": None,
+    "auto_on_create": False,
+    "auto_on_update": False,
+}
+
+
+class IRError(Exception):
+    """IR file can not be read or written."""
+
+
+@lru_cache(maxsize=None)
+def load_msgpack():
+    """msgpack module, or None when it is not installed."""
+    try:
+        import msgpack
+    except ImportError:
+        return None
+    return msgpack
+
+
+def encode_value(value):
+    """Value as JSON and msgpack compatible data, tagged when needed."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Decimal):
+        return {"$decimal": str(value)}
+    if isinstance(value, datetime.datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, bytes):
+        return {"$bytes": base64.b64encode(value).decode()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    raise IRError(f"Can not store value {value!r} of type {type(value).__name__}")
+
+
+def decode_value(value):
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if len(value) != 1:
+        raise IRError(f"Invalid tagged value {value!r}")
+    tag, data = next(iter(value.items()))
+    if tag == "$decimal":
+        return Decimal(data)
+    if tag == "$datetime":
+        return datetime.datetime.fromisoformat(data)
+    if tag == "$date":
+        return datetime.date.fromisoformat(data)
+    if tag == "$bytes":
+        return base64.b64decode(data)
+    raise IRError(f"Unknown value tag {tag!r}")
+
+
+def field_attributes(field: CoreField) -> Dict:
+    """Field attributes to store, callable default replaced as it can not be"""
+    attributes = {name: getattr(field, name) for name in FIELD_DEFAULTS}
+    default = attributes["default"]
+    if not callable(default):
+        return attributes
+    attributes["default"] = None
+    if (
+        field.sql_type in (datetime.date, datetime.datetime)
+        and getattr(default, "__name__", None) in NOW_DEFAULTS
+    ):
+        attributes["auto_on_create"] = True
+    else:
+        warnings.warn(
+            f"Callable default {default!r} of field {field.name} is not stored in IR",
+            RuntimeWarning,
+        )
+    return attributes
+
+
+def field_to_record(field: CoreField) -> Dict:
+    try:
+        record = {"name": field.name, "type": SQL_TYPE_NAMES[field.sql_type]}
+    except KeyError:
+        raise IRError(f"Unsupported type {field.sql_type!r} of field {field.name}")
+    for name, value in field_attributes(field).items():
+        default = FIELD_DEFAULTS[name]
+        if value != default or type(value) is not type(default):
+            record[name] = encode_value(value)
+    return record
+
+
+def field_from_record(record: Dict) -> CoreField:
+    params = {name: decode_value(value) for name, value in record.items()}
+    try:
+        params["sql_type"] = SQL_TYPES[params.pop("type")]
+    except KeyError as ex:
+        raise IRError(f"Invalid field record {record!r}: {ex}")
+    return CoreField(**params)
+
+
+def model_to_record(model: CoreModel) -> Dict:
+    record = {
+        "table": model.tablename,
+        "doc": model.doc,
+        "fields": [field_to_record(field) for field in model.fields],
+        "hash": model_hash(model),
+    }
+    if model.name:
+        record["name"] = model.name
+    if model.unique_together:
+        record["unique_together"] = [list(names) for names in model.unique_together]
+    return record
+
+
+def model_from_record(record: Dict) -> CoreModel:
+    kwargs = {}
+    if "doc" in record:
+        kwargs["doc"] = record["doc"]
+    if "name" in record:
+        kwargs["name"] = record["name"]
+    if "unique_together" in record:
+        kwargs["unique_together"] = tuple(
+            tuple(names) for names in record["unique_together"]
+        )
+    model = CoreModel(
+        record["table"],
+        [field_from_record(field) for field in record["fields"]],
+        **kwargs,
+    )
+    # stored hash lets diff skip unchanged tables without building structure
+    model.structure_hash = record.get("hash")
+    return model
+
+
+def header() -> Dict:
+    return {"format": IR_FORMAT, "version": IR_VERSION}
+
+
+def check_header(record) -> None:
+    if not isinstance(record, dict) or record.get("format") != IR_FORMAT:
+        raise IRError("Not an ORM Combine IR file")
+    if record.get("version") != IR_VERSION:
+        raise IRError(
+            f"IR version {record.get('version')} is not supported, "
+            f"expected {IR_VERSION}"
+        )
+
+
+def dump_ir(models: Iterable[CoreModel], stream: IO[bytes], fmt=JSON) -> int:
+    """Write models to binary stream one by one, return number written."""
+    if fmt == JSON:
+
+        def pack(record):
+            return json.dumps(record, separators=(",", ":")).encode() + b"\n"
+
+    elif fmt == MSGPACK:
+        msgpack = load_msgpack()
+        if msgpack is None:
+            raise IRError("msgpack IR needs msgpack package installed")
+        pack = msgpack.Packer().pack
+    else:
+        raise IRError(f"Unknown IR format {fmt!r}")
+    stream.write(pack(header()))
+    count = 0
+    for model in models:
+        stream.write(pack(model_to_record(model)))
+        count += 1
+    return count
+
+
+def iter_records(stream: IO[bytes]) -> Iterator:
+    if not hasattr(stream, "peek"):
+        stream = io.BufferedReader(stream)
+    if stream.peek(1)[:1] in (b"{", b""):
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+        return
+    msgpack = load_msgpack()
+    if msgpack is None:
+        raise IRError("IR file is not JSON lines, msgpack is needed to read it")
+    yield from msgpack.Unpacker(stream, raw=False)
+
+
+def load_ir(stream: IO[bytes]) -> Iterator[CoreModel]:
+    """Read models from binary stream lazily, format is detected."""
+    records = iter_records(stream)
+    check_header(next(records, None))
+    for record in records:
+        try:
+            yield model_from_record(record)
+        except (AttributeError, KeyError, TypeError, ValueError) as ex:
+            raise IRError(f"Invalid model record: {ex}") from ex
+
+
+def ir_format(path: str) -> str:
+    """msgpack for `.msgpack` and `.mpk` files, JSON lines otherwise"""
+    return MSGPACK if path.endswith((".msgpack", ".mpk")) else JSON
+
+
+def write_ir(path: str, models: Iterable[CoreModel], fmt: Optional[str] = None):
+    """Stream models to IR file, which is replaced only once all are written."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            count = dump_ir(models, f, fmt or ir_format(path))
+        os.chmod(tmp_path, file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return count
+
+
+def read_ir(path: str) -> CoreSchema:
+    with open(path, "rb") as f:
+        return CoreSchema(load_ir(f))
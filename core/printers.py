@@ -1,20 +1,23 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import Iterator, List, TextIO, Tuple
 
 
 class ModulePrinter(ABC):
     orm: str = "Abstract"
-    imports: set
+    source_suffix = ".py"
+    # False when models can not be printed one by one from stored fragments
+    supports_fragments = True
     model_printers: Tuple
 
     def __init__(self, *model_printers):
-        self.imports = set()
         self.model_printers = model_printers
 
-    def collect_import_types(self):
+    def collect_import_types(self) -> List[str]:
+        """Sorted import types used by all models, printer itself is not changed"""
+        imports = set()
         for m in self.model_printers:
-            model_import_types = m.get_import_types()
-            self.imports.update(model_import_types)
+            imports.update(m.get_import_types())
+        return sorted(imports)
 
     @abstractmethod
     def print_import_types(self):
@@ -29,15 +32,22 @@ class ModulePrinter(ABC):
         return """
 """
 
-    def print_module(self):
-        """"""
-        models_reprs = [m.print_model() for m in self.model_printers]
-
-        import_header_repr = self.line_break().join(
+    def iter_module(self) -> Iterator[str]:
+        """Yield import header, then every model as soon as it is printed"""
+        yield self.line_break().join(
             [self.print_import_types(), self.print_import_base_data()]
         )
+        for m in self.model_printers:
+            yield self.line_break() + m.print_model()
 
-        return self.line_break().join([import_header_repr, *models_reprs])
+    def write_module(self, stream: TextIO):
+        """Write module to text stream model by model"""
+        for chunk in self.iter_module():
+            stream.write(chunk)
+
+    def print_module(self):
+        """"""
+        return "".join(self.iter_module())
 
 
 class ModelPrinter(ABC):
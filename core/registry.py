@@ -0,0 +1,76 @@
+from collections.abc import Mapping
+from importlib import import_module
+from importlib import metadata
+from typing import Dict, Union
+
+
+def load_backend(path: str):
+    """Import backend by `"package.module:attribute"` path."""
+    module_name, _, attribute = path.partition(":")
+    return getattr(import_module(module_name), attribute)
+
+
+def select_entry_points(group: str):
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return entry_points.select(group=group)
+    return entry_points.get(group, [])
+
+
+class BackendRegistry(Mapping):
+    """ORM name to backend class mapping which imports backends on first use.
+
+    Built-in backends are given as `"package.module:attribute"` paths, third-party
+    ones are discovered through `group` entry points. Built-ins win name clashes.
+    """
+
+    group: str
+    paths: Dict[str, Union[str, metadata.EntryPoint]]
+    loaded: Dict[str, type]
+
+    def __init__(self, group: str, paths: Dict[str, str]):
+        self.group = group
+        self.paths = dict(paths)
+        self.loaded = {}
+        self.discovered = False
+
+    def discover(self):
+        """Collect entry point backends, only once."""
+        if self.discovered:
+            return
+        self.discovered = True
+        for entry_point in select_entry_points(self.group):
+            self.paths.setdefault(entry_point.name, entry_point)
+
+    def register(self, name: str, backend: Union[str, type]):
+        """Add backend class, or its import path to load it lazily."""
+        self.loaded.pop(name, None)
+        if isinstance(backend, str):
+            self.paths[name] = backend
+        else:
+            self.paths[name] = f"{backend.__module__}:{backend.__qualname__}"
+            self.loaded[name] = backend
+
+    def __getitem__(self, name: str):
+        if name not in self.loaded:
+            if name not in self.paths:
+                self.discover()
+            path = self.paths[name]
+            if isinstance(path, str):
+                self.loaded[name] = load_backend(path)
+            else:
+                self.loaded[name] = path.load()
+        return self.loaded[name]
+
+    def __contains__(self, name):
+        if name not in self.paths:
+            self.discover()
+        return name in self.paths
+
+    def __iter__(self):
+        self.discover()
+        return iter(self.paths)
+
+    def __len__(self):
+        self.discover()
+        return len(self.paths)
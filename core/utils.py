@@ -1,17 +1,31 @@
+import ast
+import importlib.abc
+import importlib.util
 import os
+import stat
+import sys
+import tempfile
 import uuid
-import shutil
+from types import ModuleType
+from typing import Iterable
+
+
+DJANGO_APPS_NAME = "__djfake_apps__"
 
 
 def fix_django_app_label(input_text_data: str):
-    """Every django model should have `class: Meta` param with app_label. Replace all of them with """
+    """Every django model should have `class: Meta` param with app_label. Replace all of them with
+
+    Models are also pointed to `DJANGO_APPS_NAME` app registry of their module instead of the global one.
+    """
     by_line = input_text_data.split('\n')
     for index, line in enumerate(by_line):
         if 'app_label' in line:
             by_line[index] = ""
     for index, line in enumerate(by_line):
         if 'class Meta:' in line:
-            by_line[index] += f"\n{line.split('class Meta:')[0] * 2}app_label = 'djfake'"
+            indent = line.split('class Meta:')[0] * 2
+            by_line[index] += f"\n{indent}app_label = 'djfake'\n{indent}apps = {DJANGO_APPS_NAME}"
     return "\n".join(by_line)
 
 
@@ -24,31 +38,80 @@ def detect_orm(input_text_data: str,):
     raise Exception("Unknown ORM")
 
 
+class SourceTextLoader(importlib.abc.InspectLoader):
+    """Loader building module straight from source text, no file involved."""
+
+    def __init__(self, source: str):
+        self.source = source
+
+    def get_source(self, fullname):
+        return self.source
+
+    def is_package(self, fullname):
+        return False
+
+
 def import_user_module(input_text_data: str, safe_mode=False):
-    """Save user input file as module and import it in-runtime."""
+    """Import user input as in-memory module.
+
+    In safe mode the input is only parsed and the syntax tree is returned instead.
+    Imported module stays in `sys.modules` till `release_user_module` call.
+    """
     if safe_mode:
-        raise NotImplementedError("Safe mode still not implemented")
+        return ast.parse(input_text_data)
     else:
         print(
             f"Warning: unsafe import! Any code can be execute from your modules till import processing"
         )
+    module_name = f"ormc_user_{uuid.uuid4().hex}"
+    module_globals = {}
     if detect_orm(input_text_data) == 'django':
+        from django.apps.registry import Apps
+
         input_text_data = fix_django_app_label(input_text_data)
-    temp_filename = f"temp_{uuid.uuid4()}"
+        module_globals[DJANGO_APPS_NAME] = Apps(installed_apps=())
+    loader = SourceTextLoader(input_text_data)
+    spec = importlib.util.spec_from_loader(module_name, loader, origin="<user input>")
+    module = importlib.util.module_from_spec(spec)
+    module.__dict__.update(module_globals)
+    sys.modules[module_name] = module
     try:
-        os.mkdir("cache")
-    except FileExistsError:
-        pass
-    with open(f"cache/{temp_filename}.py", "w") as f:
-        f.write(input_text_data)
-        abspath = os.path.dirname(os.path.abspath(f"{temp_filename}.py"))
-    try:
-        temp = __import__(f"cache.{temp_filename}")
+        loader.exec_module(module)
     except Exception as ex:
         print(ex)
-    finally:
-        shutil.rmtree(f"{abspath}/cache")
-    modules = dir(temp)
-    for module in modules:
-        if module == temp_filename:
-            return getattr(temp, module)
+        release_user_module(module)
+        return None
+    return module
+
+
+def release_user_module(module):
+    """Forget module imported by `import_user_module`."""
+    if isinstance(module, ModuleType):
+        sys.modules.pop(module.__name__, None)
+
+
+def file_mode(path: str) -> int:
+    """Mode of existing file, or mode a new file gets under current umask."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def write_output(output_file: str, chunks: Iterable[str]):
+    """Stream chunks to output file, which is replaced only once all are written."""
+    directory = os.path.dirname(os.path.abspath(output_file))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        # mkstemp creates owner only files
+        os.chmod(tmp_path, file_mode(output_file))
+        os.replace(tmp_path, output_file)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
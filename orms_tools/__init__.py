@@ -1,22 +1,67 @@
-from orms_tools.django_tools.dj_combine import DjangoOrmModelCombine
-from orms_tools.django_tools.dj_printers import DjangoModelPrinter, DjangoModulePrinter
-from orms_tools.sqlalchemy_tools.sa_combine import SQLAlchemyModelCombine
-from orms_tools.sqlalchemy_tools.sa_printers import (
-    SqlAlchemyModelPrinter,
-    SqlAlchemyModulePrinter,
+from core.registry import BackendRegistry, load_backend
+
+SQLALCHEMY_TOOLS = "orms_tools.sqlalchemy_tools"
+DJANGO_TOOLS = "orms_tools.django_tools"
+
+model_printers = BackendRegistry(
+    "ormc.model_printers",
+    {
+        "sa": f"{SQLALCHEMY_TOOLS}.sa_printers:SqlAlchemyModelPrinter",
+        "django": f"{DJANGO_TOOLS}.dj_printers:DjangoModelPrinter",
+    },
 )
 
-model_printers = {
-    "sa": SqlAlchemyModelPrinter,
-    "django": DjangoModelPrinter,
-}
+core_model_printers = BackendRegistry(
+    "ormc.core_model_printers",
+    {
+        "sa": f"{SQLALCHEMY_TOOLS}.sa_core_printers:SqlAlchemyCoreModelPrinter",
+        "django": f"{DJANGO_TOOLS}.dj_core_printers:DjangoCoreModelPrinter",
+        "ddl-sqlite": f"{SQLALCHEMY_TOOLS}.sa_ddl_printers:DDLCoreModelPrinter",
+        "ddl-postgresql": f"{SQLALCHEMY_TOOLS}.sa_ddl_printers:DDLCoreModelPrinter",
+    },
+)
 
-module_printers = {
-    "sa": SqlAlchemyModulePrinter,
-    "django": DjangoModulePrinter,
-}
+module_printers = BackendRegistry(
+    "ormc.module_printers",
+    {
+        "sa": f"{SQLALCHEMY_TOOLS}.sa_core_printers:SqlAlchemyModulePrinter",
+        "django": f"{DJANGO_TOOLS}.dj_core_printers:DjangoModulePrinter",
+        "ddl-sqlite": f"{SQLALCHEMY_TOOLS}.sa_ddl_printers:SQLiteDDLModulePrinter",
+        "ddl-postgresql": f"{SQLALCHEMY_TOOLS}.sa_ddl_printers:PostgreSQLDDLModulePrinter",
+    },
+)
 
-combines = {
-    "sa": SQLAlchemyModelCombine,
-    "django": DjangoOrmModelCombine,
+combines = BackendRegistry(
+    "ormc.combines",
+    {
+        "sa": f"{SQLALCHEMY_TOOLS}.sa_combine:SQLAlchemyModelCombine",
+        "django": f"{DJANGO_TOOLS}.dj_combine:DjangoOrmModelCombine",
+    },
+)
+
+ast_combines = BackendRegistry(
+    "ormc.ast_combines",
+    {
+        "sa": f"{SQLALCHEMY_TOOLS}.sa_ast_combine:SQLAlchemyAstModelCombine",
+        "django": f"{DJANGO_TOOLS}.dj_ast_combine:DjangoAstModelCombine",
+    },
+)
+
+# Backend classes stay importable by name, e.g. `from orms_tools import ...`
+builtin_backends = {
+    path.rpartition(":")[2]: path
+    for registry in (
+        model_printers,
+        core_model_printers,
+        module_printers,
+        combines,
+        ast_combines,
+    )
+    for path in registry.paths.values()
 }
+
+
+def __getattr__(name):
+    if name in builtin_backends:
+        return load_backend(builtin_backends[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,222 @@
+import ast
+from datetime import date as date_type
+from datetime import datetime as datetime_type
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from core.ast_combine import NOT_LITERAL, AbstractAstModelCombine, AstModel
+from core.db_primitives import CoreField, CoreModel
+
+from .dj_base import APP_LABEL
+
+
+class DjangoAstModelCombine(AbstractAstModelCombine):
+    """Read Django models from source without setting up Django."""
+
+    relation_names = ("ForeignKey", "OneToOneField")
+    skipped_names = ("ManyToManyField",)
+
+    type_names = {
+        "AutoField": int,
+        "BigAutoField": int,
+        "SmallAutoField": int,
+        "IntegerField": int,
+        "BigIntegerField": int,
+        "SmallIntegerField": int,
+        "PositiveIntegerField": int,
+        "PositiveBigIntegerField": int,
+        "PositiveSmallIntegerField": int,
+        "CharField": str,
+        "TextField": str,
+        "SlugField": str,
+        "EmailField": str,
+        "URLField": str,
+        "BooleanField": bool,
+        "NullBooleanField": bool,
+        "FloatField": float,
+        "DecimalField": Decimal,
+        "DateField": date_type,
+        "DateTimeField": datetime_type,
+        "BinaryField": bytes,
+    }
+
+    @classmethod
+    def is_model(cls, node: ast.ClassDef, models: Dict[str, AstModel]) -> bool:
+        for base in node.bases:
+            base_name = cls.dotted_name(base)
+            if base_name in models or (base_name or "").split(".")[-1] == "Model":
+                return True
+        return False
+
+    @classmethod
+    def retrieve_models_from_module(cls, module: ast.Module) -> List[AstModel]:
+        """Retrieve concrete model declarations from parsed module"""
+        return [
+            model
+            for model in super().retrieve_models_from_module(module)
+            if cls.meta(model).get("abstract") is not True
+        ]
+
+    @classmethod
+    def meta(cls, model: AstModel) -> Dict:
+        """Literal options of model `class Meta`."""
+        for statement in model.node.body:
+            if isinstance(statement, ast.ClassDef) and statement.name == "Meta":
+                return {
+                    name: cls.literal(value)
+                    for name, value in cls.assignments(statement)
+                }
+        return {}
+
+    def declared_fields(self, model: AstModel) -> List[Tuple[str, ast.Call]]:
+        """(attribute name, field call) pairs including abstract parents' fields."""
+        fields = []
+        for base in model.node.bases:
+            parent = model.models.get(self.dotted_name(base))
+            if parent is not None and self.meta(parent).get("abstract") is True:
+                fields.extend(self.declared_fields(parent))
+        for name, value in self.assignments(model.node):
+            if not isinstance(value, ast.Call):
+                continue
+            field_name = self.short_name(value) or ""
+            if field_name in self.skipped_names:
+                continue
+            if field_name.endswith("Field") or field_name in self.relation_names:
+                fields = [field for field in fields if field[0] != name]
+                fields.append((name, value))
+        return fields
+
+    def primary_key(self, model: AstModel) -> Tuple[str, Optional[ast.Call]]:
+        """Primary key field of model, `id` with no declaration if implicit."""
+        for name, call in self.declared_fields(model):
+            if self.literal(self.keywords(call).get("primary_key"), False) is True:
+                return name, call
+        return "id", None
+
+    def to_core_model(self, model: AstModel) -> CoreModel:
+        """Convert Django model declaration to CoreModel"""
+        meta = self.meta(model)
+        declared_fields = self.declared_fields(model)
+        fields = [
+            self.to_core_field(model, name, call) for name, call in declared_fields
+        ]
+        field_names = [name for name, _ in declared_fields]
+        if self.primary_key(model)[1] is None:
+            fields.insert(
+                0, CoreField(sql_type=int, name="id", doc="ID", primary_key=True)
+            )
+            field_names.insert(0, "id")
+
+        db_table = meta.get("db_table")
+        if not isinstance(db_table, str):
+            db_table = f"{APP_LABEL}_{model.name.lower()}"
+
+        unique_together = meta.get("unique_together") or ()
+        if unique_together is NOT_LITERAL:
+            unique_together = ()
+        if unique_together and not isinstance(unique_together[0], (tuple, list)):
+            unique_together = (unique_together,)
+
+        return CoreModel(
+            tablename=db_table,
+            name=model.name,
+            unique_together=tuple(tuple(names) for names in unique_together),
+            doc=model.doc or f"{model.name}({', '.join(field_names)})",
+            fields=fields,
+        )
+
+    def to_core_field(self, model: AstModel, name: str, call: ast.Call) -> CoreField:
+        """Convert Django field declaration to CoreField"""
+        spec_params = {}
+        kwargs = self.keywords(call)
+        field_type_name = self.short_name(call)
+        column = name
+
+        if field_type_name in self.relation_names:
+            target_model, target_name, target_call = self.foreign_key(model, call)
+            field_kwargs = {
+                "foreign_key": f"{target_model.name}.{target_name}",
+            }
+            if target_call is None:
+                original_type_name = "AutoField"
+            else:
+                original_type_name = self.short_name(target_call)
+            column = f"{name}_id"
+            verbose_name = kwargs.get("verbose_name")
+        else:
+            field_kwargs = {}
+            original_type_name = field_type_name
+            verbose_name = kwargs.get(
+                "verbose_name", call.args[0] if call.args else None
+            )
+
+        sql_type = self.type_names.get(original_type_name)
+        if not sql_type:
+            raise NotImplementedError(
+                f"Django {field_type_name} is not currently implemented"
+            )
+
+        verbose_name = self.literal(verbose_name)
+        if not isinstance(verbose_name, str):
+            verbose_name = name.replace("_", " ")
+        db_column = self.literal(kwargs.get("db_column"))
+        if isinstance(db_column, str):
+            column = db_column
+
+        default = self.literal(kwargs.get("default"))
+        if default is NOT_LITERAL:
+            default = None
+
+        if field_type_name == "DecimalField":
+            decimal_places = self.literal(kwargs.get("decimal_places"))
+            max_digits = self.literal(kwargs.get("max_digits"))
+            if isinstance(decimal_places, int) and decimal_places:
+                spec_params["precision"] = decimal_places
+            if isinstance(max_digits, int) and max_digits:
+                spec_params["scale"] = max_digits
+        if field_type_name in ("DateField", "DateTimeField"):
+            if self.literal(kwargs.get("auto_now")) is True:
+                spec_params["auto_on_create"] = True
+            if self.literal(kwargs.get("auto_now_add")) is True:
+                spec_params["auto_on_create"] = True
+                spec_params["auto_on_update"] = True
+        max_length = self.literal(kwargs.get("max_length"))
+        if isinstance(max_length, int) and sql_type in (str, bytes):
+            spec_params["length"] = max_length
+
+        return CoreField(
+            sql_type=sql_type,
+            name=column,
+            nullable=self.literal(kwargs.get("null"), False) is True,
+            primary_key=self.literal(kwargs.get("primary_key"), False) is True,
+            doc=verbose_name,
+            unique=(
+                self.literal(kwargs.get("unique"), False) is True
+                or field_type_name == "OneToOneField"
+            ),
+            default=default,
+            **field_kwargs,
+            **spec_params,
+        )
+
+    def foreign_key(self, model: AstModel, call: ast.Call):
+        """Resolve relation to (target model, target attname, target field call)."""
+        kwargs = self.keywords(call)
+        to = call.args[0] if call.args else kwargs.get("to")
+        reference = self.literal(to)
+        if not isinstance(reference, str):
+            reference = self.dotted_name(to) or ""
+        target_name = reference.split(".")[-1]
+        target_model = model if target_name == "self" else model.models.get(target_name)
+        if target_model is None:
+            raise NotImplementedError(
+                f"Django relation {model.name} -> {reference} points outside of module"
+            )
+
+        to_field = self.literal(kwargs.get("to_field"))
+        if isinstance(to_field, str):
+            for field_name, field_call in self.declared_fields(target_model):
+                if field_name == to_field:
+                    return target_model, field_name, field_call
+        field_name, field_call = self.primary_key(target_model)
+        return target_model, field_name, field_call
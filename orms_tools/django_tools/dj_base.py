@@ -0,0 +1,22 @@
+import os
+import threading
+
+APP_LABEL = "djfake"
+
+SETTINGS_MODULE = f"orms_tools.django_tools.{APP_LABEL}.{APP_LABEL}.settings"
+
+setup_lock = threading.Lock()
+
+
+def setup_django():
+    """Set up Django once per process, later calls cost one flag check."""
+    from django.apps import apps
+
+    if apps.ready:
+        return
+    with setup_lock:
+        if not apps.ready:
+            os.environ.setdefault("DJANGO_SETTINGS_MODULE", SETTINGS_MODULE)
+            import django
+
+            django.setup()
@@ -1,29 +1,45 @@
-import os
 from datetime import date as date_type
 from datetime import datetime as datetime_type
 from decimal import Decimal
+from types import MappingProxyType
 
+from django.apps.registry import Apps
 from django.db import models as dm
 
 from core.combine import AbstractModelCombine
 from core.db_primitives import CoreField, CoreModel
 
-
-APP_LABEL = "djfake"
+from .dj_base import APP_LABEL, setup_django
 
 
 class DjangoOrmModelCombine(AbstractModelCombine):
     metaclass = dm.base.ModelBase
 
+    core_types = MappingProxyType(
+        {
+            dm.IntegerField: int,
+            dm.AutoField: int,
+            dm.CharField: str,
+            dm.TextField: str,
+            dm.BooleanField: bool,
+            dm.FloatField: float,
+            dm.DecimalField: Decimal,
+            dm.DateField: date_type,
+            dm.DateTimeField: datetime_type,
+            dm.BinaryField: bytes,
+        }
+    )
+
+    apps: Apps
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        os.environ.setdefault(
-            "DJANGO_SETTINGS_MODULE",
-            f"orms_tools.django_tools.{APP_LABEL}.{APP_LABEL}.settings",
-        )
-        import django
+        setup_django()
+        self.apps = Apps(installed_apps=())
 
-        django.setup()
+    def dispose(self):
+        """Forget models built by this combine with their private app registry"""
+        self.apps = Apps(installed_apps=())
 
     @classmethod
     def is_model(cls, model):
@@ -47,9 +63,7 @@ class DjangoOrmModelCombine(AbstractModelCombine):
 
     @classmethod
     def bytes(cls, **kwargs):
-        field = dm.BinaryField
-        setattr(field, "__qualname__", "BinaryField")
-        return field
+        return dm.BinaryField
 
     @classmethod
     def decimal(cls, **kwargs):
@@ -65,7 +79,20 @@ class DjangoOrmModelCombine(AbstractModelCombine):
             pass
         return dm.DateTimeField
 
-    def get_fields(self, model: dm.Model):
+    @classmethod
+    def dispose_models(cls, models):
+        """Unregister user models from their app registry"""
+        for model in models:
+            model_apps = model._meta.apps
+            app_models = model_apps.all_models[model._meta.app_label]
+            if app_models.get(model._meta.model_name) is model:
+                del app_models[model._meta.model_name]
+            if not app_models:
+                del model_apps.all_models[model._meta.app_label]
+            model_apps.clear_cache()
+
+    @staticmethod
+    def get_fields(model: dm.Model):
         """Get fields from Django model"""
         if hasattr(model, "_meta"):
             return [f for f in model._meta.fields]
@@ -76,6 +103,7 @@ class DjangoOrmModelCombine(AbstractModelCombine):
         """Convert ORM model to CoreModel"""
         return CoreModel(
             tablename=model._meta.db_table,
+            name=model.__qualname__,
             unique_together=model._meta.unique_together,
             doc=model.__doc__,
             fields=[self.to_core_field(field) for field in self.get_fields(model)],
@@ -84,7 +112,6 @@ class DjangoOrmModelCombine(AbstractModelCombine):
     def to_core_field(self, field: dm.Field):
         """Convert ORM field to CoreField"""
         spec_params = {}
-        sql_type = None
         name = field.column
 
         field_kwargs = dict(
@@ -103,24 +130,20 @@ class DjangoOrmModelCombine(AbstractModelCombine):
         else:
             original_type = type(field)
 
-        original_type_name = original_type.__qualname__
-        for core_type, django_type in self.type_map.items():
-            suggested_type = django_type()
-            suggested_type = suggested_type.__qualname__
-            compare = original_type_name == suggested_type
-            if compare:
-                sql_type = core_type
-                break
+        sql_type = self.resolve_core_type(original_type)
         if not sql_type:
             raise NotImplementedError(
                 f"Django {type(field)} is not currently implemented"
             )
-        if original_type_name == "DecimalField":
+        if sql_type in (str, bytes) and not field.is_relation:
+            if field.max_length:
+                spec_params["length"] = field.max_length
+        if sql_type is Decimal:
             if field.decimal_places:
                 spec_params["precision"] = field.decimal_places
             if field.max_digits:
                 spec_params["scale"] = field.max_digits
-        if original_type_name in ("DateField", "DateTimeField"):
+        if sql_type in (date_type, datetime_type):
             if field.auto_now:
                 spec_params["auto_on_create"] = True
             if field.auto_now_add:
@@ -134,7 +157,11 @@ class DjangoOrmModelCombine(AbstractModelCombine):
         """Convert CoreModel to SQLAlchemy"""
         django_fields = [self.from_core_field(field) for field in model.fields]
         fields_as_dict = {f.name: f for f in django_fields}
-        meta_kwargs = {"db_table": model.tablename, "app_label": APP_LABEL}
+        meta_kwargs = {
+            "db_table": model.tablename,
+            "app_label": APP_LABEL,
+            "apps": self.apps,
+        }
         if model.unique_together:
             meta_kwargs["unique_together"] = [model.unique_together]
         meta = type("Meta", (object,), meta_kwargs)
@@ -142,7 +169,7 @@ class DjangoOrmModelCombine(AbstractModelCombine):
         django_model = dm.base.ModelBase(
             model.tablename.capitalize(),
             (dm.Model,),
-            {"Meta": meta, "__module__": "test", **fields_as_dict},
+            {"Meta": meta, "__module__": "test", "__doc__": model.doc, **fields_as_dict},
         )
         return django_model
 
@@ -168,21 +195,18 @@ class DjangoOrmModelCombine(AbstractModelCombine):
             django_type = self.type_map[field.sql_type](**column_kwargs)
         django_field_spec_params = {}
 
-        if field.spec_params:
-            if field.sql_type == Decimal:
-                if field.spec_params.get("scale"):
-                    django_field_spec_params["max_digits"] = field.spec_params["scale"]
-                if field.spec_params.get("precision"):
-                    django_field_spec_params["decimal_places"] = field.spec_params[
-                        "precision"
-                    ]
-            if field.sql_type in (date_type, datetime_type):
-                if field.spec_params.get("auto_on_update"):
-                    django_field_spec_params["auto_now_add"] = True
-                elif field.spec_params.get("auto_on_create"):
-                    django_field_spec_params["auto_now"] = True
-            if field.spec_params.get("length"):
-                django_field_spec_params["max_length"] = field.spec_params["length"]
-            column_kwargs.update(**django_field_spec_params)
+        if field.sql_type == Decimal:
+            if field.scale:
+                django_field_spec_params["max_digits"] = field.scale
+            if field.precision:
+                django_field_spec_params["decimal_places"] = field.precision
+        if field.sql_type in (date_type, datetime_type):
+            if field.auto_on_update:
+                django_field_spec_params["auto_now_add"] = True
+            elif field.auto_on_create:
+                django_field_spec_params["auto_now"] = True
+        if field.length:
+            django_field_spec_params["max_length"] = field.length
+        column_kwargs.update(**django_field_spec_params)
         django_field = django_type(**column_kwargs)
         return django_field
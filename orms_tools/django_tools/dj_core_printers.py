@@ -0,0 +1,156 @@
+from datetime import date as date_type
+from datetime import datetime as datetime_type
+from decimal import Decimal
+
+from core.db_primitives import CoreField, CoreModel
+from core.printers import ModelPrinter, ModulePrinter
+
+
+class DjangoModulePrinter(ModulePrinter):
+    orm: str = "django"
+
+    def print_import_types(self):
+        return f"from django.db.models import {', '.join(self.collect_import_types())}"
+
+    def print_import_base_data(self):
+        return "from django.db.models import Model, DO_NOTHING"
+
+
+class DjangoCoreModelPrinter(ModelPrinter):
+    """Print Django model straight from CoreModel, no ORM class involved."""
+
+    type_names = {
+        int: "IntegerField",
+        str: "CharField",
+        bool: "BooleanField",
+        float: "FloatField",
+        bytes: "BinaryField",
+        Decimal: "DecimalField",
+        date_type: "DateField",
+        datetime_type: "DateTimeField",
+    }
+
+    auto_field = "BigAutoField"
+
+    def __init__(self, model: CoreModel):
+        super().__init__()
+        self.model = model
+        self.fields = list(model.fields)
+        self.implicit_primary_key = not any(f.primary_key for f in model.fields)
+
+    def type_name(self, field: CoreField) -> str:
+        return "ForeignKey" if field.foreign_key else self.type_names[field.sql_type]
+
+    def get_import_types(self):
+        import_types = [self.type_name(field) for field in self.fields]
+        if self.implicit_primary_key:
+            import_types.insert(0, self.auto_field)
+        return import_types
+
+    def print_classname(self):
+        doc = self.model.doc
+        if doc is None:
+            field_names = [field.name for field in self.fields]
+            if self.implicit_primary_key:
+                field_names.insert(0, "id")
+            doc = f"{self.classname()}({', '.join(field_names)})"
+        return f'class {self.classname()}(Model):{self.line_break()}{self.line_space()}"""{doc}"""'
+
+    def classname(self) -> str:
+        return self.model.tablename.capitalize()
+
+    def print_metadata(self):
+        """"""
+        doc_repr = f"{self.line_space()}class Meta:"
+        tablename_repr = (
+            f'{self.line_space()}{self.line_space()}db_table = "{self.model.tablename}"'
+        )
+        if self.model.unique_together:
+            unique_together_repr = (
+                f"{self.line_space()}{self.line_space()}unique_together = ("
+            )
+            unique_together_repr += ", ".join(
+                [
+                    f"{tuple(unique_combo)}"
+                    for unique_combo in self.model.unique_together
+                ]
+            )
+            unique_together_repr += ", )"
+        else:
+            unique_together_repr = ""
+        return self.line_break().join([doc_repr, tablename_repr, unique_together_repr])
+
+    def print_fields(self):
+        """Print Fields"""
+        fields_repr = super().print_fields()
+        if self.implicit_primary_key:
+            fields_repr = (
+                f"{self.line_space()}id = {self.auto_field}(primary_key=True, help_text='ID')"
+                f"{self.line_break()}{fields_repr}"
+            )
+        return fields_repr
+
+    def print_field(self, field: CoreField):
+        type_repr = self.type_name(field)
+        field_repr = f"{field.name} = {type_repr}"
+
+        if field.foreign_key:
+            foreign_key_repr = (
+                f"{field.foreign_key_target[0].capitalize()}, on_delete=DO_NOTHING"
+            )
+        else:
+            foreign_key_repr = ""
+
+        type_args = []
+        if field.length:
+            type_args.append(f"max_length={field.length}")
+        if field.sql_type == Decimal:
+            if field.scale:
+                type_args.append(f"max_digits={field.scale}")
+            if field.precision:
+                type_args.append(f"decimal_places={field.precision}")
+
+        primary_key_repr = "primary_key=True" if field.primary_key else ""
+        default_value = (
+            f"'{field.default}'" if isinstance(field.default, str) else field.default
+        )
+        default_repr = (
+            f"default={default_value}"
+            if field.default
+            and not field.primary_key
+            and not type_repr in ("DateField", "DateTimeField")
+            else ""
+        )
+        nullable_repr = (
+            f"null=False" if field.nullable is False and not field.primary_key else ""
+        )
+        unique_repr = "unique=True" if field.unique and not field.primary_key else ""
+        verbose_name = (
+            field.doc if field.doc is not None else field.name.replace("_", " ")
+        )
+        doc_repr = f"help_text='{verbose_name}'" if verbose_name else ""
+
+        if type_repr in ("DateField", "DateTimeField"):
+            if field.auto_on_update:
+                type_args.append("auto_now_add=True")
+            elif field.auto_on_create:
+                type_args.append("auto_now=True")
+
+        field_kwargs_repr = ", ".join(
+            [
+                arg
+                for arg in (
+                    foreign_key_repr,
+                    primary_key_repr,
+                    default_repr,
+                    nullable_repr,
+                    unique_repr,
+                    doc_repr,
+                    *type_args,
+                )
+                if arg
+            ]
+        )
+
+        field_repr += f"({field_kwargs_repr})"
+        return field_repr
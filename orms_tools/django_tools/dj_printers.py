@@ -1,18 +1,6 @@
-from core.printers import ModelPrinter, ModulePrinter
+from core.printers import ModelPrinter
 from orms_tools.django_tools.dj_combine import DjangoOrmModelCombine
-
-
-class DjangoModulePrinter(ModulePrinter):
-    orm: str = "django"
-
-    def print_import_types(self):
-        for m in self.model_printers:
-            model_imports = m.get_import_types()
-            self.imports.update(model_imports)
-        return f"from django.db.models import {', '.join(self.imports)}"
-
-    def print_import_base_data(self):
-        return "from django.db.models import Model, DO_NOTHING"
+from orms_tools.django_tools.dj_core_printers import DjangoModulePrinter
 
 
 class DjangoModelPrinter(ModelPrinter):
@@ -21,7 +9,7 @@ class DjangoModelPrinter(ModelPrinter):
     def __init__(self, model):
         super().__init__()
         self.model = model
-        self.fields = DjangoOrmModelCombine().get_fields(self.model)
+        self.fields = DjangoOrmModelCombine.get_fields(self.model)
 
     def nested_iterable_repr(self, iterable):
         if not isinstance(iterable, str):
@@ -68,8 +56,11 @@ class DjangoModelPrinter(ModelPrinter):
                 type_args.append(f"{type_arg}={getattr(field, type_arg)}")
 
         primary_key_repr = "primary_key=True" if field.primary_key else ""
+        default_value = (
+            f"'{field.default}'" if isinstance(field.default, str) else field.default
+        )
         default_repr = (
-            f"default={field.default}"
+            f"default={default_value}"
             if field.default
             and not field.primary_key
             and not type_repr in ("DateField", "DateTimeField")
@@ -0,0 +1,216 @@
+import ast
+from datetime import date as date_type
+from datetime import datetime as datetime_type
+from decimal import Decimal
+from typing import Dict, Optional
+
+from core.ast_combine import NOT_LITERAL, AbstractAstModelCombine, AstModel
+from core.db_primitives import CoreField, CoreModel
+
+
+class SQLAlchemyAstModelCombine(AbstractAstModelCombine):
+    """Read SQLAlchemy declarative models from source without importing them."""
+
+    column_names = ("Column", "mapped_column")
+
+    type_names = {
+        "Integer": int,
+        "INTEGER": int,
+        "INT": int,
+        "SmallInteger": int,
+        "SMALLINT": int,
+        "BigInteger": int,
+        "BIGINT": int,
+        "String": str,
+        "Text": str,
+        "Unicode": str,
+        "UnicodeText": str,
+        "CHAR": str,
+        "VARCHAR": str,
+        "NCHAR": str,
+        "NVARCHAR": str,
+        "TEXT": str,
+        "CLOB": str,
+        "Boolean": bool,
+        "BOOLEAN": bool,
+        "Float": float,
+        "FLOAT": float,
+        "REAL": float,
+        "Numeric": Decimal,
+        "NUMERIC": Decimal,
+        "DECIMAL": Decimal,
+        "Date": date_type,
+        "DATE": date_type,
+        "DateTime": datetime_type,
+        "DATETIME": datetime_type,
+        "TIMESTAMP": datetime_type,
+        "LargeBinary": bytes,
+        "BINARY": bytes,
+        "VARBINARY": bytes,
+        "BLOB": bytes,
+    }
+
+    @classmethod
+    def is_model(cls, node: ast.ClassDef, models: Dict[str, AstModel]) -> bool:
+        return cls.tablename(node) is not None
+
+    @classmethod
+    def tablename(cls, node: ast.ClassDef) -> Optional[str]:
+        for name, value in cls.assignments(node):
+            if name == "__tablename__":
+                tablename = cls.literal(value)
+                if isinstance(tablename, str):
+                    return tablename
+        return None
+
+    def columns(self, model: AstModel):
+        """Yield (attribute name, Column call) pairs of model."""
+        for name, value in self.assignments(model.node):
+            if (
+                isinstance(value, ast.Call)
+                and self.short_name(value) in self.column_names
+            ):
+                yield name, value
+
+    def to_core_model(self, model: AstModel) -> CoreModel:
+        """Convert SQLAlchemy model declaration to CoreModel"""
+        model_kwargs = {
+            "tablename": self.tablename(model.node),
+            "name": model.name,
+            "doc": model.doc,
+            "fields": [
+                self.to_core_field(model, name, call)
+                for name, call in self.columns(model)
+            ],
+        }
+        unique_together = []
+        for name, value in self.assignments(model.node):
+            if name == "__table_args__" and isinstance(value, (ast.Tuple, ast.List)):
+                for arg in value.elts:
+                    if (
+                        isinstance(arg, ast.Call)
+                        and self.short_name(arg) == "UniqueConstraint"
+                        and len(arg.args) > 1
+                    ):
+                        columns = tuple(self.literal(col) for col in arg.args)
+                        if all(isinstance(col, str) for col in columns):
+                            unique_together.append(columns)
+        if unique_together:
+            model_kwargs["unique_together"] = tuple(unique_together)
+        return CoreModel(**model_kwargs)
+
+    def to_core_field(self, model: AstModel, name: str, call: ast.Call) -> CoreField:
+        """Convert Column declaration to CoreField"""
+        spec_params = {}
+        kwargs = self.keywords(call)
+        type_node = kwargs.get("type_")
+        foreign_key = None
+        foreign_key_node = None
+
+        for arg in call.args:
+            arg_name = self.short_name(arg)
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                name = arg.value
+            elif arg_name == "ForeignKey":
+                foreign_key_node = arg
+            elif arg_name in self.type_names:
+                type_node = arg
+        if "name" in kwargs and isinstance(self.literal(kwargs["name"]), str):
+            name = self.literal(kwargs["name"])
+
+        if foreign_key_node is not None:
+            foreign_key, target_model, target_name = self.foreign_key(
+                model, foreign_key_node
+            )
+
+        if type_node is not None:
+            sql_type = self.type_names.get(self.short_name(type_node))
+        elif foreign_key:
+            target = self.target_column(target_model, target_name)
+            sql_type = target and self.to_core_field(target_model, *target).sql_type
+        else:
+            sql_type = None
+        if not sql_type:
+            raise NotImplementedError(
+                f"SQLAlchemy column {model.name}.{name} type is not currently implemented"
+            )
+
+        if isinstance(type_node, ast.Call):
+            type_kwargs = self.keywords(type_node)
+            if sql_type in (str, bytes):
+                positional = ("length",)
+            elif sql_type in (float, Decimal):
+                positional = ("precision", "scale")
+            else:
+                positional = ()
+            for param, value in zip(positional, type_node.args):
+                type_kwargs.setdefault(param, value)
+            for param in positional:
+                value = self.literal(type_kwargs.get(param))
+                if value is not None and value is not NOT_LITERAL:
+                    spec_params[param] = value
+
+        default_value = self.literal(kwargs.get("default"))
+        if default_value is NOT_LITERAL:
+            default_value = None
+        if sql_type in (date_type, datetime_type):
+            if self.short_name(kwargs.get("default")) == "utcnow":
+                spec_params["auto_on_create"] = True
+            if self.short_name(kwargs.get("onupdate")) == "utcnow":
+                spec_params["auto_on_update"] = True
+
+        primary_key = self.literal(kwargs.get("primary_key"), False) is True
+        nullable = self.literal(kwargs.get("nullable"), not primary_key)
+        if not isinstance(nullable, bool):
+            nullable = not primary_key
+        doc = self.literal(kwargs.get("doc"))
+        return CoreField(
+            name=name,
+            nullable=nullable,
+            primary_key=primary_key,
+            doc=doc if isinstance(doc, str) else None,
+            sql_type=sql_type,
+            unique=self.literal(kwargs.get("unique"), False) is True,
+            default=default_value,
+            foreign_key=foreign_key,
+            **spec_params,
+        )
+
+    def foreign_key(self, model: AstModel, call: ast.Call):
+        """Resolve ForeignKey declaration to core reference and target field."""
+        column = call.args[0] if call.args else self.keywords(call).get("column")
+        reference = self.literal(column)
+        if isinstance(reference, str):
+            tablename, _, column_name = reference.rpartition(".")
+            target_model = next(
+                (
+                    m
+                    for m in model.models.values()
+                    if self.tablename(m.node) == tablename.split(".")[-1]
+                ),
+                None,
+            )
+        else:
+            reference = self.dotted_name(column)
+            if not reference or "." not in reference:
+                raise NotImplementedError(
+                    f"SQLAlchemy foreign key in {model.name} is not a column reference"
+                )
+            classname, _, column_name = reference.rpartition(".")
+            target_model = model.models.get(classname)
+            if target_model is None:
+                raise NotImplementedError(
+                    f"SQLAlchemy foreign key {reference} points outside of module"
+                )
+            tablename = self.tablename(target_model.node)
+
+        foreign_key = f"{tablename.split('.')[-1].capitalize()}.{column_name}"
+        return foreign_key, target_model, column_name
+
+    def target_column(self, model: Optional[AstModel], name: str):
+        """Find (attribute name, Column call) of foreign key target."""
+        if model is None:
+            return None
+        return next(
+            (column for column in self.columns(model) if column[0] == name), None
+        )
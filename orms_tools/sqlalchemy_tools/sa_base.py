@@ -2,6 +2,8 @@ import sqlalchemy as sa
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm.decl_api import DeclarativeMeta
 
-metadata = sa.MetaData()
 
-SABase: DeclarativeMeta = declarative_base(metadata=metadata)
+def make_base() -> DeclarativeMeta:
+    """Declarative base with its own MetaData, so conversions never share tables."""
+    metadata = sa.MetaData()
+    return declarative_base(metadata=metadata)
@@ -1,4 +1,6 @@
 import datetime
+from decimal import Decimal
+from types import MappingProxyType
 from typing import List
 
 from sqlalchemy.orm import ColumnProperty, DeclarativeMeta, class_mapper
@@ -6,14 +8,39 @@ from sqlalchemy.orm import ColumnProperty, DeclarativeMeta, class_mapper
 from core.combine import AbstractModelCombine
 from core.db_primitives import CoreField, CoreModel
 
-from .sa_base import SABase, metadata, sa
+from .sa_base import make_base, sa
 
 
 class SQLAlchemyModelCombine(AbstractModelCombine):
     metaclass = DeclarativeMeta
+    base: DeclarativeMeta
+
+    core_types = MappingProxyType(
+        {
+            sa.Integer: int,
+            sa.String: str,
+            sa.Boolean: bool,
+            sa.Float: float,
+            sa.Numeric: Decimal,
+            sa.Date: datetime.date,
+            sa.DateTime: datetime.datetime,
+            sa.LargeBinary: bytes,
+            sa.BINARY: bytes,
+            sa.VARBINARY: bytes,
+        }
+    )
 
     def __init__(self, *args):
         super().__init__(*args)
+        self.base = make_base()
+        # table names of built models by class name, Django foreign keys refer to them
+        self.tablenames = {}
+
+    def dispose(self):
+        """Dispose mappers and tables of models built by this combine"""
+        self.base.registry.dispose()
+        self.base.metadata.clear()
+        self.tablenames.clear()
 
     @classmethod
     def is_model(cls, model):
@@ -66,7 +93,14 @@ class SQLAlchemyModelCombine(AbstractModelCombine):
                 pass
         return sa.DateTime(**kwargs)
 
-    def get_fields(self, model) -> List[ColumnProperty]:
+    @classmethod
+    def dispose_models(cls, models):
+        """Dispose mappers of user models registries"""
+        for registry in {model.registry for model in models}:
+            registry.dispose()
+
+    @staticmethod
+    def get_fields(model) -> List[ColumnProperty]:
         fields = []
         mapper = class_mapper(model)
         for v in mapper.iterate_properties:
@@ -74,10 +108,11 @@ class SQLAlchemyModelCombine(AbstractModelCombine):
                 fields.append(v)
         return fields
 
-    def to_core_model(self, model: SABase) -> CoreModel:
+    def to_core_model(self, model: DeclarativeMeta) -> CoreModel:
         """Convert SQLAlchemy Model to CoreModel"""
         model_kwargs = {
             "tablename": model.__tablename__,
+            "name": model.__name__,
             "doc": model.__doc__,
             "fields": [self.to_core_field(field) for field in self.get_fields(model)],
         }
@@ -97,19 +132,21 @@ class SQLAlchemyModelCombine(AbstractModelCombine):
             raise
         column = field.expression
 
-        sql_type = None
-        for core_type in self.type_map.keys():
-            if core_type == column.type.python_type:
-                sql_type = core_type
-                break
+        sql_type = self.resolve_core_type(type(column.type))
         if not sql_type:
-            raise
+            raise NotImplementedError(
+                f"SQLAlchemy {type(column.type)} is not currently implemented"
+            )
 
         if column.default:
             default_value = column.default.arg
         else:
             default_value = None
 
+        if isinstance(column.type, (sa.String, sa.BINARY)):
+            if column.type.length:
+                spec_params["length"] = column.type.length
+
         if isinstance(column.type, (sa.Float, sa.DECIMAL)):
             if column.type.precision:
                 spec_params["precision"] = column.type.precision
@@ -141,8 +178,10 @@ class SQLAlchemyModelCombine(AbstractModelCombine):
         )
         return core_field
 
-    def from_core_model(self, model: CoreModel) -> SABase:
+    def from_core_model(self, model: CoreModel) -> DeclarativeMeta:
         """Convert CoreModel to SQLAlchemy Model"""
+        if model.name:
+            self.tablenames[model.name.lower()] = model.tablename
         fields = [self.from_core_field(field) for field in model.fields]
         fields_as_dict = {f.name: f for f in fields}
         unique_together = []
@@ -159,7 +198,7 @@ class SQLAlchemyModelCombine(AbstractModelCombine):
             model_kwargs["__table_args__"] = tuple(unique_together)
         sa_model = DeclarativeMeta(
             model.tablename.capitalize(),
-            (SABase,),
+            (self.base,),
             model_kwargs,
         )
         return sa_model
@@ -170,9 +209,11 @@ class SQLAlchemyModelCombine(AbstractModelCombine):
         sa_type_instance = sa_type(**field.spec_params)
         relations = []
         if field.foreign_key:
+            tablename, column = field.foreign_key_target
+            tablename = self.tablenames.get(tablename, tablename)
             relations.append(
                 sa.ForeignKey(
-                    column=field.foreign_key.lower(),
+                    column=f"{tablename}.{column}",
                     name=field.name,
                 ),
             )
@@ -184,9 +225,9 @@ class SQLAlchemyModelCombine(AbstractModelCombine):
             unique=field.unique,
             nullable=field.nullable,
         )
-        if field.spec_params.get('auto_on_create'):
+        if field.auto_on_create:
             column_kwargs['default'] = datetime.datetime.utcnow
-        if field.spec_params.get('auto_on_update'):
+        if field.auto_on_update:
             column_kwargs['onupdate'] = datetime.datetime.utcnow
         sa_field = sa.Column(sa_type_instance, *relations, **column_kwargs)
         return sa_field
@@ -0,0 +1,140 @@
+from datetime import date as date_type
+from datetime import datetime as datetime_type
+from decimal import Decimal
+
+from core.db_primitives import CoreField, CoreModel
+from core.printers import ModelPrinter, ModulePrinter
+
+
+class SqlAlchemyModulePrinter(ModulePrinter):
+    orm = "sqlalchemy"
+
+    def print_import_types(self):
+        return f"from sqlalchemy import {', '.join(self.collect_import_types())}"
+
+    def print_import_base_data(self):
+        """"""
+        return """
+import datetime
+from sqlalchemy import MetaData
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm.decl_api import DeclarativeMeta
+
+metadata = MetaData()
+SABase: DeclarativeMeta = declarative_base(metadata=metadata)
+"""
+
+
+class SqlAlchemyCoreModelPrinter(ModelPrinter):
+    """Print SQLAlchemy model straight from CoreModel, no ORM class involved."""
+
+    type_names = {
+        int: "Integer",
+        bool: "Boolean",
+        float: "Float",
+        bytes: "BINARY",
+        Decimal: "DECIMAL",
+        date_type: "Date",
+        datetime_type: "DateTime",
+    }
+
+    def __init__(self, model: CoreModel):
+        super().__init__()
+        self.model = model
+        self.fields = model.fields
+
+    def type_name(self, field: CoreField) -> str:
+        if field.sql_type == str:
+            return "String" if field.length else "Text"
+        return self.type_names[field.sql_type]
+
+    def get_import_types(self):
+        import_types = [self.type_name(field) for field in self.fields]
+        import_types.append("Column")
+        import_types.append("UniqueConstraint")
+        import_types.append("ForeignKey")
+        return import_types
+
+    def print_field(self, field: CoreField):
+        field_repr = f"{field.name} = Column"
+
+        type_args = []
+        if field.sql_type in (str, bytes, Decimal):
+            for type_arg in ("length", "precision", "scale"):
+                if getattr(field, type_arg) is not None:
+                    type_args.append(f"{type_arg}={getattr(field, type_arg)}")
+        type_repr = f'{self.type_name(field)}({", ".join(type_args)})'
+
+        if field.foreign_key:
+            tablename, column = field.foreign_key_target
+            foreign_key_repr = f"ForeignKey({tablename.capitalize()}.{column})"
+        else:
+            foreign_key_repr = ""
+
+        primary_key_repr = "primary_key=True" if field.primary_key else ""
+
+        default_repr = ""
+        onupdate_repr = ""
+        if field.sql_type in (date_type, datetime_type):
+            if field.auto_on_create:
+                default_repr = "default=datetime.datetime.utcnow"
+            if field.auto_on_update and (
+                field.auto_on_create or field.default is not None
+            ):
+                onupdate_repr = "onupdate=datetime.datetime.utcnow"
+        elif field.default is not None:
+            if isinstance(field.default, str):
+                default_repr = f"default='{field.default}'"
+            else:
+                default_repr = f"default={field.default}"
+
+        nullable = (
+            "nullable=False"
+            if field.nullable is False and not field.primary_key
+            else ""
+        )
+        unique_repr = "unique=True" if field.unique and not field.primary_key else ""
+        doc_repr = f"doc='{field.doc}'" if field.doc else ""
+
+        field_kwargs_repr = ", ".join(
+            [
+                arg
+                for arg in (
+                    type_repr,
+                    foreign_key_repr,
+                    primary_key_repr,
+                    default_repr,
+                    onupdate_repr,
+                    nullable,
+                    unique_repr,
+                    doc_repr,
+                )
+                if arg
+            ]
+        )
+
+        field_repr += f"({field_kwargs_repr})"
+        return field_repr
+
+    def print_metadata(self):
+        """"""
+        tablename_repr = f'{self.line_space()}__tablename__ = "{self.model.tablename}"'
+        if self.model.unique_together:
+            args_repr = []
+            for unique_seq in self.model.unique_together:
+                if len(unique_seq) > 1:
+                    unique_together_fields_repr = ", ".join(
+                        [f"'{name}'" for name in unique_seq]
+                    )
+                    args_repr.append(
+                        f"UniqueConstraint({unique_together_fields_repr}),"
+                    )
+            table_args_repr = (
+                f'{self.line_space()}__table_args__ = ({", ".join(args_repr)})'
+            )
+        else:
+            table_args_repr = ""
+        return self.line_break().join([tablename_repr, table_args_repr])
+
+    def print_classname(self):
+        return f'class {self.model.tablename.capitalize()}(SABase):{self.line_break()}{self.line_space()}"""{self.model.doc}"""'
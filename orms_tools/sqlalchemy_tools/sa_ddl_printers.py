@@ -0,0 +1,155 @@
+import datetime
+import warnings
+from decimal import Decimal
+from typing import Iterator, List
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import AddConstraint, CreateIndex, CreateTable
+from sqlalchemy.sql.ddl import sort_tables_and_constraints
+
+from core.db_primitives import CoreField, CoreModel, CoreSchema
+from core.printers import ModulePrinter
+
+
+class DDLCoreModelPrinter:
+    """Hand CoreModel to DDL module printer, tables are rendered with whole schema
+    as foreign keys have to resolve."""
+
+    model: CoreModel
+
+    def __init__(self, model: CoreModel):
+        self.model = model
+
+    def get_import_types(self) -> List[str]:
+        return []
+
+
+class DDLModulePrinter(ModulePrinter):
+    """Print CREATE TABLE and CREATE INDEX statements straight from CoreModels.
+
+    Tables are built on a MetaData of their own, no ORM class is involved, and
+    streamed in foreign key dependency order. Foreign keys of cycles are added by
+    ALTER TABLE at the end where dialect supports it.
+    """
+
+    orm = "ddl"
+    source_suffix = ".sql"
+    supports_fragments = False
+    dialect: sa.engine.Dialect
+
+    def print_import_types(self):
+        return ""
+
+    def print_import_base_data(self):
+        return ""
+
+    @staticmethod
+    def column_type(field: CoreField):
+        if field.sql_type is str:
+            return sa.String(field.length) if field.length else sa.Text()
+        if field.sql_type is Decimal:
+            # CoreField precision is decimal places and scale is total digits
+            return sa.Numeric(precision=field.scale, scale=field.precision)
+        if field.sql_type is bytes:
+            return sa.LargeBinary(field.length)
+        return {
+            int: sa.Integer,
+            bool: sa.Boolean,
+            float: sa.Float,
+            datetime.date: sa.Date,
+            datetime.datetime: sa.DateTime,
+        }[field.sql_type]()
+
+    @staticmethod
+    def server_default(field: CoreField):
+        if field.auto_on_create:
+            if field.sql_type is datetime.datetime:
+                return sa.func.current_timestamp()
+            return sa.func.current_date()
+        value = field.default
+        if isinstance(value, bool):
+            return sa.true() if value else sa.false()
+        if isinstance(value, (int, float, Decimal)):
+            return sa.text(str(value))
+        if isinstance(value, str):
+            return value
+        return None
+
+    def build_table(
+        self, model: CoreModel, schema: CoreSchema, metadata: sa.MetaData
+    ) -> sa.Table:
+        columns = []
+        indexes = []
+        for field in model.fields:
+            constraints = []
+            target = schema.resolve_foreign_key(field)
+            if target is None and field.foreign_key:
+                warnings.warn(
+                    f"Foreign key {model.tablename}.{field.name} -> "
+                    f"{field.foreign_key} points outside of schema, "
+                    f"it is left out of DDL",
+                    RuntimeWarning,
+                )
+            if target is not None:
+                target_model, target_field = target
+                constraints.append(
+                    sa.ForeignKey(f"{target_model.tablename}.{target_field.name}")
+                )
+                if not field.primary_key and not field.unique:
+                    indexes.append(field.name)
+            server_default = self.server_default(field)
+            columns.append(
+                sa.Column(
+                    field.name,
+                    self.column_type(field),
+                    *constraints,
+                    primary_key=bool(field.primary_key),
+                    nullable=bool(field.nullable) and not field.primary_key,
+                    unique=bool(field.unique) and not field.primary_key,
+                    server_default=server_default,
+                    autoincrement=False,
+                )
+            )
+        table = sa.Table(model.tablename, metadata, *columns)
+        for names in model.unique_together:
+            table.append_constraint(sa.UniqueConstraint(*names))
+        for name in indexes:
+            sa.Index(f"ix_{model.tablename}_{name}", table.c[name])
+        return table
+
+    def compile(self, statement) -> str:
+        return f"{str(statement.compile(dialect=self.dialect)).strip()};\n"
+
+    def iter_module(self) -> Iterator[str]:
+        """Yield header, then every table with its indexes in dependency order"""
+        yield f"-- Generated By ORM Combine for {self.dialect.name}\n"
+        schema = CoreSchema(printer.model for printer in self.model_printers)
+        metadata = sa.MetaData()
+        tables = [self.build_table(model, schema, metadata) for model in schema]
+        for table, foreign_keys in sort_tables_and_constraints(tables):
+            if table is None:
+                if self.dialect.supports_alter:
+                    for constraint in foreign_keys:
+                        yield "\n" + self.compile(AddConstraint(constraint))
+                continue
+            if not self.dialect.supports_alter:
+                # without ALTER every foreign key has to be inline, SQLite
+                # does not check referenced tables exist when creating
+                foreign_keys = None
+            statements = [
+                CreateTable(table, include_foreign_key_constraints=foreign_keys)
+            ]
+            statements.extend(
+                CreateIndex(index)
+                for index in sorted(table.indexes, key=lambda index: index.name)
+            )
+            yield "\n" + "".join(self.compile(statement) for statement in statements)
+
+
+class SQLiteDDLModulePrinter(DDLModulePrinter):
+    dialect = sqlite.dialect()
+
+
+class PostgreSQLDDLModulePrinter(DDLModulePrinter):
+    dialect = postgresql.dialect()
@@ -3,30 +3,9 @@ import datetime
 import sqlalchemy as sa
 from sqlalchemy.orm import ColumnProperty
 
-from core.printers import ModelPrinter, ModulePrinter
+from core.printers import ModelPrinter
 from orms_tools.sqlalchemy_tools.sa_combine import SQLAlchemyModelCombine
-
-
-class SqlAlchemyModulePrinter(ModulePrinter):
-    orm = "sqlalchemy"
-
-    def print_import_types(self):
-        for m in self.model_printers:
-            model_imports = m.get_import_types()
-            self.imports.update(model_imports)
-        return f"from sqlalchemy import {', '.join(self.imports)}"
-
-    def print_import_base_data(self):
-        """"""
-        return """
-import datetime
-from sqlalchemy import MetaData
-from sqlalchemy.orm import declarative_base
-from sqlalchemy.orm.decl_api import DeclarativeMeta
-
-metadata = MetaData()
-SABase: DeclarativeMeta = declarative_base(metadata=metadata)
-"""
+from orms_tools.sqlalchemy_tools.sa_core_printers import SqlAlchemyModulePrinter
 
 
 class SqlAlchemyModelPrinter(ModelPrinter):
@@ -35,7 +14,7 @@ class SqlAlchemyModelPrinter(ModelPrinter):
     def __init__(self, model):
         super().__init__()
         self.model = model
-        self.fields = SQLAlchemyModelCombine().get_fields(self.model)
+        self.fields = SQLAlchemyModelCombine.get_fields(self.model)
 
     def get_import_types(self):
         import_types = [
@@ -84,7 +63,7 @@ class SqlAlchemyModelPrinter(ModelPrinter):
             if column.type.python_type in (datetime.date, datetime.datetime):
                 default_repr, onupdate_repr = self._print_datetime_defaults(column)
             else:
-                if column.default.is_text:
+                if isinstance(column.default.arg, str):
                     default_value = f"'{column.default.arg}'"
                 else:
                     default_value = f"{column.default.arg}"
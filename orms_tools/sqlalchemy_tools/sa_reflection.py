@@ -0,0 +1,366 @@
+import ast
+import fnmatch
+import os
+from decimal import Decimal
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from sqlalchemy.engine import Engine
+
+from core.db_primitives import CoreField, CoreModel, CoreSchema
+
+from .sa_base import sa
+from .sa_combine import SQLAlchemyModelCombine
+
+AUTO_NOW_DEFAULTS = ("current_timestamp", "current_date", "now", "localtimestamp")
+
+
+class ReflectedTable(NamedTuple):
+    """Everything inspector reports about one table."""
+
+    name: str
+    columns: List[Dict]
+    primary_key: Dict
+    foreign_keys: List[Dict]
+    unique_constraints: List[Dict]
+    indexes: List[Dict]
+    comment: Optional[str] = None
+
+
+class SQLAlchemyReflectionCombine:
+    """Build CoreModels from tables of existing database with SQLAlchemy inspector.
+
+    Columns, keys and constraints of all tables are read in a few queries: with
+    table-valued pragmas on SQLite, `get_multi_*` calls on SQLAlchemy 2.0.
+    Other inspectors are asked table by table.
+    `tables` are fnmatch patterns of table names to reflect, all by default.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        schema: Optional[str] = None,
+        tables: Optional[Sequence[str]] = None,
+    ):
+        self.engine = engine
+        self.schema = schema
+        self.tables = tables
+
+    def table_names(self, inspector) -> List[str]:
+        names = inspector.get_table_names(schema=self.schema)
+        if self.tables:
+            names = [
+                name
+                for name in names
+                if any(fnmatch.fnmatch(name, pattern) for pattern in self.tables)
+            ]
+        return names
+
+    def retrieve_models_from_database(self) -> List[ReflectedTable]:
+        inspector = sa.inspect(self.engine)
+        names = self.table_names(inspector)
+        if not names:
+            return []
+        if self.engine.dialect.name == "sqlite":
+            return self.reflect_sqlite(names)
+        if hasattr(inspector, "get_multi_columns"):
+            return list(self.reflect_multi(inspector, names))
+        return list(self.reflect_each(inspector, names))
+
+    def reflect_multi(self, inspector, names: List[str]) -> Iterator[ReflectedTable]:
+        kwargs = {"schema": self.schema, "filter_names": names}
+        columns = inspector.get_multi_columns(**kwargs)
+        primary_keys = inspector.get_multi_pk_constraint(**kwargs)
+        foreign_keys = inspector.get_multi_foreign_keys(**kwargs)
+        unique_constraints = inspector.get_multi_unique_constraints(**kwargs)
+        indexes = inspector.get_multi_indexes(**kwargs)
+        try:
+            comments = inspector.get_multi_table_comment(**kwargs)
+        except NotImplementedError:
+            comments = {}
+        for name in names:
+            key = (self.schema, name)
+            yield ReflectedTable(
+                name,
+                columns.get(key, []),
+                primary_keys.get(key) or {},
+                foreign_keys.get(key, []),
+                unique_constraints.get(key, []),
+                indexes.get(key, []),
+                (comments.get(key) or {}).get("text"),
+            )
+
+    def reflect_sqlite(self, names: List[str]) -> List[ReflectedTable]:
+        """Reflect all tables at once, per table PRAGMAs get slower as schema grows"""
+        dialect = self.engine.dialect
+        schema = self.schema or "main"
+        master = f"{dialect.identifier_preparer.quote(schema)}.sqlite_master"
+        tables = {
+            name: ReflectedTable(name, [], {"constrained_columns": []}, [], [], [])
+            for name in names
+        }
+        primary_keys = {name: [] for name in names}
+        with self.engine.connect() as connection:
+
+            def query(sql):
+                for row in connection.exec_driver_sql(sql, (schema,) * sql.count("?")):
+                    if row[0] in tables:
+                        yield row
+
+            for table_name, name, type_, notnull, default, pk in query(
+                'SELECT m.name, p.name, p.type, p."notnull", p.dflt_value, p.pk '
+                f"FROM {master} AS m, pragma_table_info(m.name, ?) AS p "
+                "WHERE m.type = 'table' ORDER BY m.name, p.cid"
+            ):
+                tables[table_name].columns.append(
+                    {
+                        "name": name,
+                        "type": self.sqlite_column_type(dialect, type_),
+                        "nullable": not notnull,
+                        "default": default,
+                    }
+                )
+                if pk:
+                    primary_keys[table_name].append((pk, name))
+
+            foreign_keys = {}
+            for table_name, fk_id, referred, column, referred_column in query(
+                'SELECT m.name, f.id, f."table", f."from", f."to" '
+                f"FROM {master} AS m, pragma_foreign_key_list(m.name, ?) AS f "
+                "WHERE m.type = 'table' ORDER BY m.name, f.id, f.seq"
+            ):
+                foreign_key = foreign_keys.setdefault(
+                    (table_name, fk_id),
+                    {
+                        "referred_table": referred,
+                        "constrained_columns": [],
+                        "referred_columns": [],
+                    },
+                )
+                foreign_key["constrained_columns"].append(column)
+                foreign_key["referred_columns"].append(referred_column)
+
+            indexes = {}
+            for table_name, index_name, unique, origin, column in query(
+                'SELECT m.name, l.name, l."unique", l.origin, i.name '
+                f"FROM {master} AS m, pragma_index_list(m.name, ?) AS l, "
+                "pragma_index_info(l.name, ?) AS i "
+                "WHERE m.type = 'table' ORDER BY m.name, l.name, i.seqno"
+            ):
+                index = indexes.setdefault(
+                    (table_name, index_name),
+                    {
+                        "name": index_name,
+                        "column_names": [],
+                        "unique": bool(unique),
+                        "origin": origin,
+                    },
+                )
+                index["column_names"].append(column)
+
+        for name, columns in primary_keys.items():
+            tables[name].primary_key["constrained_columns"] = [
+                column for _, column in sorted(columns)
+            ]
+        for (table_name, _), foreign_key in foreign_keys.items():
+            if None in foreign_key["referred_columns"]:
+                # REFERENCES without columns points to primary key
+                referred = tables.get(foreign_key["referred_table"])
+                if referred is None:
+                    continue
+                foreign_key["referred_columns"] = referred.primary_key[
+                    "constrained_columns"
+                ]
+            tables[table_name].foreign_keys.append(foreign_key)
+        for (table_name, _), index in indexes.items():
+            origin = index.pop("origin")
+            if None in index["column_names"] or origin == "pk":
+                continue
+            if origin == "u":
+                tables[table_name].unique_constraints.append(
+                    {"name": index["name"], "column_names": index["column_names"]}
+                )
+            else:
+                tables[table_name].indexes.append(index)
+        return list(tables.values())
+
+    @staticmethod
+    def sqlite_column_type(dialect, declared: str):
+        """Type of column declared as `declared` by SQLite affinity rules.
+
+        SQLAlchemy implements the rules in a private dialect method, without it
+        types are looked up by name and unknown ones are NullType.
+        """
+        resolve = getattr(dialect, "_resolve_type_affinity", None)
+        if resolve is not None:
+            try:
+                return resolve(declared)
+            except (TypeError, ValueError):
+                pass
+        name = declared.partition("(")[0].strip().upper()
+        return dialect.ischema_names.get(name, sa.types.NullType)()
+
+    def reflect_each(self, inspector, names: List[str]) -> Iterator[ReflectedTable]:
+        schema = self.schema
+        for name in names:
+            try:
+                comment = inspector.get_table_comment(name, schema=schema).get("text")
+            except NotImplementedError:
+                comment = None
+            # copied, some dialects sort cached columns in place to find primary key
+            columns = list(inspector.get_columns(name, schema=schema))
+            yield ReflectedTable(
+                name,
+                columns,
+                inspector.get_pk_constraint(name, schema=schema) or {},
+                inspector.get_foreign_keys(name, schema=schema),
+                inspector.get_unique_constraints(name, schema=schema),
+                inspector.get_indexes(name, schema=schema),
+                comment,
+            )
+
+    @staticmethod
+    def model_name(table: ReflectedTable) -> str:
+        return table.name
+
+    @staticmethod
+    def dispose_models(tables: List[ReflectedTable]):
+        """Reflected tables hold no ORM state"""
+
+    def dispose(self):
+        """Combine keeps no state besides engine, which belongs to caller"""
+
+    @staticmethod
+    def unique_column_groups(table: ReflectedTable) -> List[tuple]:
+        groups = [
+            tuple(constraint["column_names"]) for constraint in table.unique_constraints
+        ]
+        for index in table.indexes:
+            if index.get("unique"):
+                groups.append(tuple(index["column_names"]))
+        return list(dict.fromkeys(groups))
+
+    def to_core_model(self, table: ReflectedTable) -> CoreModel:
+        """Convert reflected table to CoreModel"""
+        unique_groups = self.unique_column_groups(table)
+        unique_columns = {group[0] for group in unique_groups if len(group) == 1}
+        primary_key = set(table.primary_key.get("constrained_columns") or ())
+        foreign_keys = {}
+        for foreign_key in table.foreign_keys:
+            if len(foreign_key["constrained_columns"]) == 1:
+                foreign_keys[foreign_key["constrained_columns"][0]] = (
+                    f"{foreign_key['referred_table'].capitalize()}."
+                    f"{foreign_key['referred_columns'][0]}"
+                )
+        model_kwargs = {
+            "tablename": table.name,
+            "fields": [
+                self.to_core_field(
+                    column,
+                    primary_key=column["name"] in primary_key,
+                    unique=column["name"] in unique_columns,
+                    foreign_key=foreign_keys.get(column["name"]),
+                )
+                for column in table.columns
+            ],
+            "unique_together": tuple(
+                group for group in unique_groups if len(group) > 1
+            ),
+        }
+        if table.comment:
+            model_kwargs["doc"] = table.comment
+        return CoreModel(**model_kwargs)
+
+    def to_core_field(
+        self, column: Dict, primary_key=False, unique=False, foreign_key=None
+    ) -> CoreField:
+        """Convert reflected column to CoreField"""
+        column_type = column["type"]
+        sql_type = SQLAlchemyModelCombine.resolve_core_type(type(column_type))
+        if not sql_type:
+            raise NotImplementedError(
+                f"Column {column['name']} of type {column_type!r} is not currently "
+                f"implemented"
+            )
+        spec_params = {}
+        if isinstance(column_type, sa.String) and column_type.length:
+            spec_params["length"] = column_type.length
+        if isinstance(column_type, sa.Numeric):
+            # CoreField precision is decimal places and scale is total digits
+            if column_type.scale:
+                spec_params["precision"] = column_type.scale
+            if column_type.precision:
+                spec_params["scale"] = column_type.precision
+        default = self.server_default_value(column.get("default"), sql_type)
+        if isinstance(column_type, (sa.Date, sa.DateTime)) and default is None:
+            server_default = (column.get("default") or "").strip("()").lower()
+            if server_default in AUTO_NOW_DEFAULTS:
+                spec_params["auto_on_create"] = True
+        return CoreField(
+            sql_type=sql_type,
+            name=column["name"],
+            doc=column.get("comment") or "",
+            primary_key=primary_key,
+            foreign_key=foreign_key,
+            nullable=column.get("nullable", True),
+            unique=unique,
+            default=default,
+            **spec_params,
+        )
+
+    @staticmethod
+    def server_default_value(server_default: Optional[str], sql_type: type):
+        """Python value of literal server default, None for SQL expressions"""
+        if server_default is None:
+            return None
+        text = server_default.strip()
+        while text.startswith("(") and text.endswith(")"):
+            text = text[1:-1].strip()
+        text = text.split("::", 1)[0]
+        if sql_type is bool and text.lower() in ("true", "false"):
+            return text.lower() == "true"
+        try:
+            value = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            return None
+        try:
+            if sql_type is bool:
+                return bool(int(value)) if not isinstance(value, str) else None
+            if sql_type is Decimal:
+                return Decimal(str(value))
+            if sql_type in (int, float, str):
+                return sql_type(value)
+        except (TypeError, ValueError, ArithmeticError):
+            return None
+        return None
+
+
+def reflect_database(
+    engine: Union[str, Engine],
+    schema: Optional[str] = None,
+    tables: Optional[Sequence[str]] = None,
+) -> CoreSchema:
+    """Core models of database tables, `engine` may be URL."""
+    owns_engine = isinstance(engine, str)
+    if owns_engine:
+        engine = sa.create_engine(engine)
+    url = engine.url
+    database = url.database or ""
+    if (
+        url.get_backend_name() == "sqlite"
+        and database not in ("", ":memory:")
+        and not database.startswith("file:")
+        and not os.path.exists(database)
+    ):
+        # connecting would create an empty database file
+        if owns_engine:
+            engine.dispose()
+        raise FileNotFoundError(f"SQLite database {database} does not exist")
+    try:
+        combine = SQLAlchemyReflectionCombine(engine, schema, tables)
+        return CoreSchema(
+            combine.to_core_model(table)
+            for table in combine.retrieve_models_from_database()
+        )
+    finally:
+        if owns_engine:
+            engine.dispose()
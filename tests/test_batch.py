@@ -0,0 +1,55 @@
+import os
+import shutil
+
+from user_interfaces.batch import collect_input_files, convert_batch, output_paths
+
+
+def make_tree(tmp_path):
+    for service, fixture in (("users", "sa_start.py"), ("billing", "django_start.py")):
+        os.makedirs(tmp_path / "src" / service)
+        shutil.copy(f"fixtures/{fixture}", tmp_path / "src" / service / "models.py")
+    (tmp_path / "src" / "billing" / "views.py").write_text("import django\n")
+    return tmp_path / "src"
+
+
+def test_collect_input_files(tmp_path):
+    src = make_tree(tmp_path)
+    assert collect_input_files([str(src)]) == [
+        str(src / "billing" / "models.py"),
+        str(src / "users" / "models.py"),
+    ]
+    assert collect_input_files([f"{src}/**/*.py"]) == [
+        str(src / "billing" / "models.py"),
+        str(src / "billing" / "views.py"),
+        str(src / "users" / "models.py"),
+    ]
+
+
+def test_output_paths(tmp_path):
+    src = make_tree(tmp_path)
+    inputs = collect_input_files([str(src)])
+    assert output_paths(inputs, "sa")[inputs[0]] == str(
+        src / "billing" / "models_sa.py"
+    )
+    assert output_paths(inputs, "sa", str(tmp_path / "out"))[inputs[1]] == str(
+        tmp_path / "out" / "users" / "models.py"
+    )
+
+
+def test_convert_batch(tmp_path):
+    src = make_tree(tmp_path)
+    (src / "broken").mkdir()
+    (src / "broken" / "models.py").write_text("nothing to see here\n")
+
+    failures = convert_batch(
+        [str(src)],
+        "django",
+        output_dir=str(tmp_path / "out"),
+        jobs=2,
+        safe_mode=True,
+        format_outputs=False,
+    )
+
+    assert list(failures) == [str(src / "broken" / "models.py")]
+    assert "class User(Model)" in (tmp_path / "out" / "users" / "models.py").read_text()
+    assert (tmp_path / "out" / "billing" / "models.py").exists()
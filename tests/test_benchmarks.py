@@ -0,0 +1,36 @@
+from app import App
+from benchmarks.generator import generate_module, generate_specs
+from benchmarks.run import STAGES, check, measure, scaling_exponents
+
+
+def test_generate_specs():
+    specs = generate_specs(50, fields=6, fk_density=0.5, unique_together_density=0.5)
+    assert len(specs) == 50
+    assert all(len(spec.fields) == 6 for spec in specs)
+    assert all(target < spec.index for spec in specs for target in spec.foreign_keys)
+    assert any(spec.foreign_keys for spec in specs)
+    assert any(spec.unique_together for spec in specs)
+    assert generate_specs(50)[7].fields == generate_specs(50)[7].fields
+
+
+def test_generated_modules_convert():
+    for input_orm, output_orm in (("sa", "django"), ("django", "sa")):
+        source = generate_module(input_orm, 20, fk_density=1.0, seed=3)
+        for safe_mode in (False, True):
+            output = App().process(source, output_orm, safe_mode=safe_mode)
+            assert output.count("class Model") == 20
+        assert set(measure(source, output_orm, safe_mode=True)) == set(STAGES)
+
+
+def test_scaling_gate():
+    linear = {size: {name: size * 1e-4 for name in STAGES} for size in (100, 1000)}
+    quadratic = {
+        size: {name: size * size * 1e-6 for name in STAGES} for size in (100, 1000)
+    }
+    exponents = scaling_exponents(linear)
+    assert all(abs(exponent - 1) < 1e-9 for exponent in exponents.values())
+
+    baseline = {"tolerance": 0.25, "exponents": {"sa->django": exponents}}
+    assert check({"sa->django": exponents}, baseline) == []
+    regressions = check({"sa->django": scaling_exponents(quadratic)}, baseline)
+    assert len(regressions) == len(STAGES)
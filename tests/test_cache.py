@@ -0,0 +1,61 @@
+import os
+
+import app as app_module
+from app import App
+from core.cache import ConversionCache
+
+with open("fixtures/sa_start.py") as f:
+    sa_example_text = f.read()
+
+
+def test_cache_key():
+    key = ConversionCache.key(sa_example_text, "django")
+    assert key == ConversionCache.key(sa_example_text, "django")
+    assert key != ConversionCache.key(sa_example_text, "sa")
+    assert key != ConversionCache.key(sa_example_text, "django", safe_mode=True)
+    assert key != ConversionCache.key(sa_example_text + "\n", "django")
+
+
+def test_cache_hit_skips_conversion(tmp_path, monkeypatch):
+    cache = ConversionCache(str(tmp_path))
+    app = App(cache=cache)
+    output = app.process(sa_example_text, "django", safe_mode=True)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache hit must not import user module")
+
+    monkeypatch.setattr(app_module, "import_user_module", fail)
+    assert App(cache=cache).process(sa_example_text, "django", safe_mode=True) == output
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # output suffix of builtin targets is known without importing printers
+    monkeypatch.setattr(app_module, "module_printers", None)
+    output_file = str(tmp_path / "output" / "models.py")
+    App(cache=cache).process_to_file(
+        sa_example_text, "django", output_file, safe_mode=True
+    )
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = ConversionCache(str(tmp_path), max_entries=2)
+    for index, key in enumerate(("a", "b")):
+        cache.put(key, key)
+        os.utime(cache.path(key), ns=(index, index))
+    assert cache.get("a") == "a"
+    cache.put("c", "c")
+    assert sorted(os.listdir(tmp_path)) == ["a.py", "c.py"]
+    assert cache.get("b") is None
+
+
+def test_cache_writer_discards_incomplete_output(tmp_path):
+    cache = ConversionCache(str(tmp_path))
+    try:
+        with cache.writer("key") as f:
+            f.write("partial")
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert os.listdir(tmp_path) == []
+    assert cache.get("key") is None
@@ -1,15 +1,24 @@
 import datetime
 import decimal
+import os
+import sys
+import warnings
 
 import sqlalchemy as sa
+from django.apps import apps as django_apps
 from django.db import models as dm
 
 from conftest import (
     payment_core_model,
     user_core_model,
 )
-from core.utils import import_user_module
-from orms_tools import DjangoOrmModelCombine, SQLAlchemyModelCombine
+from core.utils import import_user_module, release_user_module
+from orms_tools import (
+    DjangoAstModelCombine,
+    DjangoOrmModelCombine,
+    SQLAlchemyAstModelCombine,
+    SQLAlchemyModelCombine,
+)
 
 sa_combine = SQLAlchemyModelCombine()
 django_combine = DjangoOrmModelCombine()
@@ -24,11 +33,27 @@ with open('fixtures/django_start.py') as f:
 def test_import_sa_user_module():
     user_module = import_user_module(sa_example_text)
     assert user_module.User
+    release_user_module(user_module)
 
 
 def test_import_djangoorm_user_module():
     user_module = import_user_module(djangoorm_example_text)
     assert user_module.User
+    django_combine.dispose_models(
+        django_combine.retrieve_models_from_module(user_module)
+    )
+    release_user_module(user_module)
+
+
+def test_import_user_module_in_memory():
+    modules_before = set(sys.modules)
+    user_module = import_user_module(sa_example_text)
+    assert user_module.__name__ in sys.modules
+    assert not os.path.exists("cache")
+
+    sa_combine.dispose_models(sa_combine.retrieve_models_from_module(user_module))
+    release_user_module(user_module)
+    assert set(sys.modules) == modules_before
 
 
 def test_retrieve_sa_models_from_module():
@@ -36,6 +61,7 @@ def test_retrieve_sa_models_from_module():
     models = SQLAlchemyModelCombine.retrieve_models_from_module(user_module)
     assert isinstance(models, list)
     assert len(models) == 2
+    release_user_module(user_module)
 
 
 def test_retrieve_djangoorm_models_from_module():
@@ -43,6 +69,8 @@ def test_retrieve_djangoorm_models_from_module():
     models = django_combine.retrieve_models_from_module(user_module)
     assert isinstance(models, list)
     assert len(models) == 2
+    django_combine.dispose_models(models)
+    release_user_module(user_module)
 
 
 def test_to_core_model():
@@ -58,6 +86,8 @@ def test_to_core_model():
         user_core_model = combine.to_core_model(models[0])
         payment_core_model = combine.to_core_model(models[1])
         result_models.append(user_core_model)
+        combine.dispose_models(models)
+        release_user_module(module)
 
         # check metadata
         assert user_core_model.tablename == "user"
@@ -94,6 +124,143 @@ def test_to_core_model():
         assert user_core_model.nickname.unique
 
 
+def test_ast_to_core_model():
+    combine = SQLAlchemyAstModelCombine()
+    module = import_user_module(sa_example_text, safe_mode=True)
+    user_core_model, payment_core_model = combine.retrieve_models_from_module(module)
+    user_core_model = combine.to_core_model(user_core_model)
+    payment_core_model = combine.to_core_model(payment_core_model)
+
+    assert user_core_model.tablename == "user"
+    assert user_core_model.doc == "Some User Table."
+    assert user_core_model.unique_together == (("level", "coeff"),)
+
+    assert user_core_model.id.primary_key
+    assert user_core_model.nickname.sql_type == str
+    assert user_core_model.level.sql_type == int
+    assert user_core_model.is_active.sql_type == bool
+    assert user_core_model.coeff.sql_type == float
+    assert user_core_model.signature.sql_type == bytes
+    assert user_core_model.birthday.sql_type == datetime.date
+    assert user_core_model.reg_time.sql_type == datetime.datetime
+    assert user_core_model.balance.sql_type == decimal.Decimal
+
+    assert user_core_model.is_active.default is True
+    assert user_core_model.signature.default == b"0101"
+    assert not user_core_model.signature.nullable
+    assert user_core_model.reg_time.spec_params["auto_on_create"]
+    assert not user_core_model.reg_time.spec_params.get("auto_on_update")
+    assert user_core_model.birthday.spec_params["auto_on_update"]
+    assert user_core_model.balance.spec_params["precision"] == 2
+    assert user_core_model.balance.spec_params["scale"] == 10
+    assert user_core_model.nickname.unique
+
+    assert payment_core_model.user_id.foreign_key == "User.id"
+    assert payment_core_model.user_id.sql_type == int
+
+
+def test_django_ast_to_core_model():
+    combine = DjangoAstModelCombine()
+    module = import_user_module(djangoorm_example_text, safe_mode=True)
+    user_core_model, payment_core_model = combine.retrieve_models_from_module(module)
+    user_core_model = combine.to_core_model(user_core_model)
+    payment_core_model = combine.to_core_model(payment_core_model)
+
+    assert user_core_model.tablename == "user"
+    assert user_core_model.doc == "Some User Table."
+    assert user_core_model.unique_together == (("level", "coeff"),)
+
+    assert user_core_model.id.primary_key
+    assert user_core_model.id.doc == "UserId"
+    assert user_core_model.nickname.sql_type == str
+    assert user_core_model.nickname.spec_params["length"] == 20
+    assert user_core_model.level.sql_type == int
+    assert user_core_model.is_active.sql_type == bool
+    assert user_core_model.coeff.sql_type == float
+    assert user_core_model.signature.sql_type == bytes
+    assert user_core_model.birthday.sql_type == datetime.date
+    assert user_core_model.reg_time.sql_type == datetime.datetime
+    assert user_core_model.balance.sql_type == decimal.Decimal
+
+    assert user_core_model.is_active.default is True
+    assert user_core_model.reg_time.spec_params["auto_on_create"]
+    assert not user_core_model.reg_time.spec_params.get("auto_on_update")
+    assert user_core_model.birthday.spec_params["auto_on_update"]
+    assert user_core_model.balance.spec_params["precision"] == 2
+    assert user_core_model.balance.spec_params["scale"] == 10
+    assert user_core_model.nickname.unique
+
+    assert payment_core_model.user_id.foreign_key == "User.id"
+    assert payment_core_model.user_id.sql_type == int
+    assert not payment_core_model.user_id.nullable
+
+
+def test_django_ast_abstract_and_implicit_primary_key():
+    module = import_user_module(
+        """
+from django.db import models
+
+
+class Timestamped(models.Model):
+    created = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class Tag(Timestamped):
+    title = models.TextField(null=True)
+    parent = models.ForeignKey("self", on_delete=models.CASCADE)
+""",
+        safe_mode=True,
+    )
+    combine = DjangoAstModelCombine()
+    (tag,) = combine.retrieve_models_from_module(module)
+    tag_core_model = combine.to_core_model(tag)
+
+    assert tag_core_model.tablename == "djfake_tag"
+    assert [field.name for field in tag_core_model.fields] == [
+        "id",
+        "created",
+        "title",
+        "parent_id",
+    ]
+    assert tag_core_model.id.primary_key
+    assert tag_core_model.title.nullable
+    assert tag_core_model.parent_id.foreign_key == "Tag.id"
+    assert tag_core_model.parent_id.sql_type == int
+
+
+def test_ast_safe_mode_does_not_execute_module():
+    module = import_user_module(
+        'raise RuntimeError("executed")\n' + sa_example_text, safe_mode=True
+    )
+    models = SQLAlchemyAstModelCombine.retrieve_models_from_module(module)
+    assert [model.name for model in models] == ["User", "Payment"]
+
+
+def test_ast_non_literal_arguments_fall_back_to_defaults():
+    module = import_user_module(
+        "import sqlalchemy as sa\n"
+        "from sqlalchemy.orm import declarative_base\n"
+        "Base = declarative_base()\n"
+        "DOC = 'Nickname'\n"
+        "FLAG = False\n"
+        "class User(Base):\n"
+        "    __tablename__ = 'user'\n"
+        "    id = sa.Column(sa.Integer, primary_key=True)\n"
+        "    nickname = sa.Column(sa.String, doc=DOC, unique=FLAG, nullable=FLAG)\n",
+        safe_mode=True,
+    )
+    combine = SQLAlchemyAstModelCombine()
+    (model,) = combine.retrieve_models_from_module(module)
+    nickname = combine.to_core_model(model).nickname
+    assert nickname.doc is None
+    assert nickname.unique is False
+    assert nickname.nullable is True
+    assert nickname.primary_key is False
+
+
 def test_sa_from_core_model():
     sa_user_model = sa_combine.from_core_model(user_core_model)
     sa_payment_model = sa_combine.from_core_model(payment_core_model)
@@ -135,6 +302,17 @@ def test_sa_from_core_model():
     assert sa_user_model.balance.type.scale == 10
 
 
+def test_sa_from_core_model_isolated_per_combine():
+    for _ in range(3):
+        combine = SQLAlchemyModelCombine()
+        combine.from_core_model(user_core_model)
+        combine.from_core_model(payment_core_model)
+        assert sorted(combine.base.metadata.tables) == ["payment", "user"]
+        combine.dispose()
+        assert not combine.base.metadata.tables
+        assert not combine.base.registry.mappers
+
+
 def test_basic_model_to_djangoorm_model():
     django_model_user = django_combine.from_core_model(user_core_model)
     django_payment_model = django_combine.from_core_model(payment_core_model)
@@ -174,3 +352,70 @@ def test_basic_model_to_djangoorm_model():
     assert django_model_user.balance.field.max_digits == 10
 
     assert django_model_user.nickname.field.unique
+
+
+def test_djangoorm_models_isolated_from_global_apps():
+    global_models = {
+        label: dict(models) for label, models in django_apps.all_models.items()
+    }
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        for _ in range(3):
+            combine = DjangoOrmModelCombine()
+            user_model = combine.from_core_model(user_core_model)
+            combine.from_core_model(payment_core_model)
+            assert user_model._meta.apps is combine.apps
+            combine.dispose()
+
+            user_module = import_user_module(djangoorm_example_text)
+            models = combine.retrieve_models_from_module(user_module)
+            assert models and all(m._meta.apps is not django_apps for m in models)
+            combine.dispose_models(models)
+            release_user_module(user_module)
+    assert {
+        label: dict(models) for label, models in django_apps.all_models.items()
+    } == global_models
+
+
+def test_resolve_core_type_follows_mro():
+    assert DjangoOrmModelCombine.resolve_core_type(dm.BigAutoField) is int
+    assert DjangoOrmModelCombine.resolve_core_type(dm.PositiveIntegerField) is int
+    assert DjangoOrmModelCombine.resolve_core_type(dm.EmailField) is str
+    assert DjangoOrmModelCombine.resolve_core_type(dm.DateTimeField) is datetime.datetime
+    assert DjangoOrmModelCombine.resolve_core_type(dm.DateField) is datetime.date
+    assert DjangoOrmModelCombine.resolve_core_type(dm.JSONField) is None
+
+    assert SQLAlchemyModelCombine.resolve_core_type(sa.BigInteger) is int
+    assert SQLAlchemyModelCombine.resolve_core_type(sa.Unicode) is str
+    assert SQLAlchemyModelCombine.resolve_core_type(sa.Float) is float
+    assert SQLAlchemyModelCombine.resolve_core_type(sa.DECIMAL) is decimal.Decimal
+    assert SQLAlchemyModelCombine.resolve_core_type(sa.BINARY) is bytes
+
+
+def test_app_process_from_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app import App
+
+    app = App()
+    jobs = [
+        (text, to_orm, safe_mode)
+        for text in (sa_example_text, djangoorm_example_text)
+        for to_orm in ("sa", "django")
+        for safe_mode in (False, True)
+    ] * 4
+    expected = {job: app.process(*job) for job in set(jobs)}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda job: app.process(*job), jobs))
+    assert results == [expected[job] for job in jobs]
+
+
+def test_safe_mode_output_matches_exec_output():
+    from app import App
+
+    app = App()
+    for text in (sa_example_text, djangoorm_example_text):
+        for to_orm in ("sa", "django"):
+            assert app.process(text, to_orm, safe_mode=True) == app.process(
+                text, to_orm
+            )
@@ -0,0 +1,50 @@
+import os
+import threading
+import time
+
+import pytest
+
+from core.formatting import format_source
+from user_interfaces.client import ConversionError, convert, request
+from user_interfaces.daemon import ConversionDaemon
+
+with open("fixtures/sa_start.py") as f:
+    sa_example_text = f.read()
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    socket_path = str(tmp_path / "ormc.sock")
+    daemon = ConversionDaemon(socket_path)
+    thread = threading.Thread(target=daemon.run, daemon=True)
+    thread.start()
+    for _ in range(500):
+        if os.path.exists(socket_path):
+            break
+        time.sleep(0.01)
+    yield daemon
+    request({"command": "stop"}, socket_path)
+    thread.join(10)
+    assert not os.path.exists(socket_path)
+
+
+def test_daemon_converts(daemon):
+    output = convert(
+        sa_example_text, "django", safe_mode=True, socket_path=daemon.socket_path
+    )
+    assert "class User(Model)" in output
+    assert format_source(output) == output
+    assert request({"command": "ping"}, daemon.socket_path) == {"output": "pong"}
+
+    with pytest.raises(ConversionError):
+        convert("nothing to see here\n", "django", socket_path=daemon.socket_path)
+
+
+def test_client_falls_back_to_in_process(tmp_path):
+    output = convert(
+        sa_example_text,
+        "django",
+        safe_mode=True,
+        socket_path=str(tmp_path / "missing.sock"),
+    )
+    assert "class User(Model)" in output
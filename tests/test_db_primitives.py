@@ -0,0 +1,51 @@
+import sys
+from decimal import Decimal
+
+import pytest
+
+from conftest import payment_core_model, user_core_model
+from core.db_primitives import CoreField, CoreModel, CoreSchema
+
+
+def test_core_field_is_slotted():
+    field = CoreField(sql_type=str, name="nickname", length=32)
+    assert not hasattr(field, "__dict__")
+    with pytest.raises(AttributeError):
+        field.unknown = 1
+    with pytest.raises(TypeError):
+        CoreField(sql_type=str, name="nickname", max_length=32)
+    assert sys.getsizeof(field) < 200
+
+
+def test_core_field_spec_params():
+    field = CoreField(sql_type=Decimal, name="balance", precision=2, scale=10)
+    assert field.spec_params == {"precision": 2, "scale": 10}
+    assert CoreField(sql_type=int, name="id").spec_params == {}
+
+
+def test_core_model_field_lookup():
+    assert user_core_model.fields_by_name["nickname"] is user_core_model.nickname
+    assert user_core_model.get_field("missing") is None
+    with pytest.raises(AttributeError):
+        user_core_model.missing
+    assert user_core_model.nickname.table_related == "user"
+    assert [
+        tuple(field.name for field in fields)
+        for fields in user_core_model.unique_together_fields()
+    ] == [("level", "coeff")]
+
+
+def test_core_schema_resolves_foreign_key():
+    schema = CoreSchema([user_core_model, payment_core_model])
+    assert len(schema) == 2
+    assert schema.get_model("User") is user_core_model
+    model, field = schema.resolve_foreign_key(payment_core_model.user_id)
+    assert model is user_core_model
+    assert field is user_core_model.id
+    assert schema.resolve_foreign_key(user_core_model.id) is None
+
+    orphan = CoreModel(
+        tablename="orphan",
+        fields=[CoreField(sql_type=int, name="ref", foreign_key="Missing.id")],
+    )
+    assert schema.resolve_foreign_key(orphan.ref) is None
@@ -0,0 +1,101 @@
+import sqlite3
+import warnings
+
+import pytest
+
+from app import App
+from conftest import payment_core_model, user_core_model
+from core.db_primitives import CoreField, CoreModel
+from core.ir import model_to_record
+from orms_tools.sqlalchemy_tools.sa_reflection import reflect_database
+
+
+def print_ddl(models, target):
+    return "".join(App().print_core_models(models, target))
+
+
+def test_ddl_in_foreign_key_order():
+    ddl = print_ddl([payment_core_model, user_core_model], "ddl-postgresql")
+    assert ddl.index('CREATE TABLE "user"') < ddl.index("CREATE TABLE payment")
+    assert 'FOREIGN KEY(user_id) REFERENCES "user" (id)' in ddl
+    assert "CREATE INDEX ix_payment_user_id ON payment (user_id);" in ddl
+
+
+def test_ddl_foreign_key_cycle():
+    def model(name, other):
+        return CoreModel(
+            name,
+            [
+                CoreField(sql_type=int, name="id", primary_key=True),
+                CoreField(sql_type=int, name=f"{other}_id", foreign_key=f"{other}.id"),
+            ],
+        )
+
+    models = [model("left", "right"), model("right", "left")]
+    ddl = print_ddl(models, "ddl-postgresql")
+    assert ddl.count("ALTER TABLE") == 2
+    assert "FOREIGN KEY" not in ddl.split("ALTER TABLE")[0]
+
+    ddl = print_ddl(models, "ddl-sqlite")
+    assert "ALTER TABLE" not in ddl
+    assert ddl.count("FOREIGN KEY") == 2
+
+
+def test_sqlite_ddl_round_trip(tmp_path):
+    path = tmp_path / "schema.db"
+    with sqlite3.connect(path) as connection:
+        connection.executescript(
+            print_ddl([user_core_model, payment_core_model], "ddl-sqlite")
+        )
+    schema = reflect_database(f"sqlite:///{path}")
+    user = schema.get_model("user")
+    for name in ("nickname", "balance"):
+        expected = model_to_record(user_core_model)["fields"]
+        (record,) = [field for field in expected if field["name"] == name]
+        (reflected,) = [
+            field for field in model_to_record(user)["fields"] if field["name"] == name
+        ]
+        for key in ("type", "length", "precision", "scale", "unique"):
+            assert reflected.get(key) == record.get(key)
+    assert user.unique_together == user_core_model.unique_together
+    assert schema.get_model("payment").user_id.foreign_key == "User.id"
+
+
+def test_ddl_output_suffix(tmp_path):
+    assert App.output_suffix("ddl-sqlite") == ".sql"
+    assert App.output_suffix("sa") == ".py"
+
+
+def test_ddl_of_django_models_keeps_foreign_keys():
+    source = (
+        "from django.db import models\n\n"
+        "import django\n"
+        "django.setup()\n\n\n"
+        "class UserProfile(models.Model):\n"
+        "    class Meta:\n"
+        "        pass\n\n"
+        "    id = models.IntegerField(primary_key=True)\n\n\n"
+        "class Post(models.Model):\n"
+        "    class Meta:\n"
+        "        pass\n\n"
+        "    id = models.IntegerField(primary_key=True)\n"
+        "    author = models.ForeignKey(UserProfile, on_delete=models.CASCADE)\n"
+    )
+    for safe_mode in (True, False):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            ddl = App().process(source, "ddl-postgresql", safe_mode=safe_mode)
+        assert "REFERENCES djfake_userprofile (id)" in ddl
+
+
+def test_ddl_warns_about_unresolved_foreign_keys():
+    model = CoreModel(
+        "post",
+        [
+            CoreField(sql_type=int, name="id", primary_key=True),
+            CoreField(sql_type=int, name="author_id", foreign_key="Author.id"),
+        ],
+    )
+    with pytest.warns(RuntimeWarning):
+        ddl = print_ddl([model], "ddl-postgresql")
+    assert "REFERENCES" not in ddl
@@ -0,0 +1,106 @@
+from conftest import payment_core_model, user_core_model
+from core import diff
+from core.db_primitives import CoreField, CoreModel
+from core.diff import DiffOperation, diff_schemas, model_hash
+from core.ir import field_from_record, field_to_record, read_ir, write_ir
+
+
+def copy_model(model, fields=None, unique_together=None, doc=None):
+    return CoreModel(
+        model.tablename,
+        [field_from_record(field_to_record(field)) for field in model.fields]
+        if fields is None
+        else fields,
+        doc=model.doc if doc is None else doc,
+        unique_together=model.unique_together
+        if unique_together is None
+        else unique_together,
+    )
+
+
+def test_unchanged_schema_has_no_operations():
+    old = [user_core_model, payment_core_model]
+    new = [copy_model(payment_core_model, doc="Other doc"), copy_model(user_core_model)]
+    assert model_hash(new[1]) == model_hash(user_core_model)
+    assert list(diff_schemas(old, new)) == []
+
+
+def test_unchanged_tables_are_not_compared(monkeypatch):
+    compared = []
+    diff_models = diff.diff_models
+    monkeypatch.setattr(
+        diff,
+        "diff_models",
+        lambda old, new, *structures: compared.append(new)
+        or diff_models(old, new, *structures),
+    )
+    changed = copy_model(
+        payment_core_model,
+        fields=[
+            field_from_record(field_to_record(field))
+            for field in payment_core_model.fields
+        ]
+        + [CoreField(sql_type=str, name="note")],
+    )
+    list(
+        diff_schemas([user_core_model, payment_core_model], [user_core_model, changed])
+    )
+    assert compared == [changed]
+
+
+def test_schema_operations():
+    fields = [
+        field_from_record(field_to_record(field)) for field in user_core_model.fields
+    ]
+    by_name = {field.name: field for field in fields}
+    by_name["nickname"].length = 64
+    by_name["nickname"].nullable = False
+    by_name["level"].unique = True
+    fields.remove(by_name["coeff"])
+    fields.append(CoreField(sql_type=int, name="team_id", foreign_key="Team.id"))
+    new_user = copy_model(user_core_model, fields=fields, unique_together=(("level",),))
+    team = CoreModel("team", [CoreField(sql_type=int, name="id", primary_key=True)])
+
+    operations = list(
+        diff_schemas([user_core_model, payment_core_model], [new_user, team])
+    )
+
+    assert [str(operation) for operation in operations] == [
+        "alter_column user.level unique: False -> True",
+        "alter_column user.nickname type: str(32) -> str(64)",
+        "alter_column user.nickname nullable: True -> False",
+        "add_column user.team_id",
+        "drop_column user.coeff",
+        "add_unique_together user (level)",
+        "drop_unique_together user (level, coeff)",
+        "add_table team",
+        "drop_table payment",
+    ]
+    assert operations[4] == DiffOperation(
+        "drop_column",
+        "user",
+        "coeff",
+        old={
+            "type": "float(8)",
+            "primary_key": False,
+            "nullable": True,
+            "unique": False,
+            "foreign_key": None,
+        },
+    )
+    assert operations[3].new["foreign_key"] == "team.id"
+
+
+def test_ir_hashes_skip_unchanged_tables(tmp_path, monkeypatch):
+    path = str(tmp_path / "schema.ir")
+    write_ir(path, [user_core_model, payment_core_model])
+    old, new = read_ir(path), read_ir(path)
+    built = []
+    model_structure = diff.model_structure
+    monkeypatch.setattr(
+        diff,
+        "model_structure",
+        lambda model: built.append(model) or model_structure(model),
+    )
+    assert list(diff_schemas(old, new)) == []
+    assert built == []
@@ -0,0 +1,27 @@
+from core import formatting
+from core.formatting import format_source, load_black
+
+
+def test_format_source():
+    assert format_source("x = {  'a':1 }\n") == 'x = {"a": 1}\n'
+    assert format_source("def broken(:\n") == "def broken(:\n"
+
+
+def test_format_source_reuses_mode():
+    assert load_black() is load_black()
+
+
+def test_format_source_without_black(monkeypatch):
+    monkeypatch.setattr(formatting, "load_black", lambda: None)
+    assert format_source("x = {  'a':1 }\n") == "x = {  'a':1 }\n"
+
+
+def test_format_chunks_matches_whole_module():
+    from app import App
+    from core.formatting import format_chunks
+
+    with open("fixtures/django_start.py") as f:
+        raw_text = f.read()
+    app = App()
+    chunks = list(app.convert(raw_text, "sa", safe_mode=True))
+    assert "".join(format_chunks(chunks)) == format_source("".join(chunks))
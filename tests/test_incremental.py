@@ -0,0 +1,57 @@
+from app import App
+from core.incremental import FragmentStore, model_fingerprints
+from orms_tools import SQLAlchemyAstModelCombine
+
+with open("fixtures/sa_start.py") as f:
+    sa_example_text = f.read()
+
+
+def test_model_fingerprints_follow_dependencies():
+    fingerprints = model_fingerprints(sa_example_text, "django")
+    assert set(fingerprints) == {"User", "Payment"}
+
+    changed_payment = sa_example_text.replace(
+        "sum = sa.Column(sa.DECIMAL)", "total = sa.Column(sa.DECIMAL)"
+    )
+    changed = model_fingerprints(changed_payment, "django")
+    assert changed["User"] == fingerprints["User"]
+    assert changed["Payment"] != fingerprints["Payment"]
+
+    changed_user = sa_example_text.replace("doc='User level'", "doc='Level'")
+    changed = model_fingerprints(changed_user, "django")
+    assert changed["User"] != fingerprints["User"]
+    assert changed["Payment"] != fingerprints["Payment"]
+
+    assert model_fingerprints(sa_example_text, "sa") != fingerprints
+
+
+def test_incremental_conversion_reuses_unchanged_models(tmp_path, monkeypatch):
+    converted = []
+    to_core_model = SQLAlchemyAstModelCombine.to_core_model
+
+    def tracking_to_core_model(self, model):
+        converted.append(model.name)
+        return to_core_model(self, model)
+
+    monkeypatch.setattr(
+        SQLAlchemyAstModelCombine, "to_core_model", tracking_to_core_model
+    )
+    fragments = FragmentStore(str(tmp_path))
+    app = App(fragments=fragments)
+
+    output = app.process(sa_example_text, "django", safe_mode=True)
+    assert sorted(converted) == ["Payment", "User"]
+    assert sorted(output.splitlines()) == sorted(
+        App().process(sa_example_text, "django", safe_mode=True).splitlines()
+    )
+
+    converted.clear()
+    assert app.process(sa_example_text, "django", safe_mode=True) == output
+    assert converted == []
+
+    changed_payment = sa_example_text.replace(
+        "sum = sa.Column(sa.DECIMAL)", "total = sa.Column(sa.DECIMAL)"
+    )
+    output = app.process(changed_payment, "django", safe_mode=True)
+    assert converted == ["Payment"]
+    assert "total = DecimalField" in output
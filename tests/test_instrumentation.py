@@ -0,0 +1,106 @@
+import io
+import json
+import tracemalloc
+
+from app import App
+from core.instrumentation import (
+    Instrumentation,
+    JsonLinesExporter,
+    StageEvent,
+    StageObserver,
+)
+
+
+class Recorder(StageObserver):
+    def __init__(self):
+        self.events = []
+
+    def stage_started(self, event: StageEvent):
+        self.events.append(event)
+
+    def stage_finished(self, event: StageEvent):
+        self.events.append(event)
+
+
+def read_fixture():
+    with open("fixtures/django_start.py") as f:
+        return f.read()
+
+
+def test_app_emits_stage_events(tmp_path):
+    recorder = Recorder()
+    app = App(observers=[recorder])
+    output_file = str(tmp_path / "out.py")
+    app.process_to_file(read_fixture(), "sa", output_file, verify=True)
+
+    finished = [(e.stage, e.model) for e in recorder.events if e.event == "end"]
+    assert finished == [
+        ("detect", None),
+        ("import", None),
+        ("retrieve", None),
+        ("to_core", "User"),
+        ("to_core", "Payment"),
+        ("print", None),
+        ("print", "User"),
+        ("print", "Payment"),
+        ("from_core", "user"),
+        ("from_core", "payment"),
+        ("format", None),
+        ("write", None),
+    ]
+    started = [(e.stage, e.model) for e in recorder.events if e.event == "start"]
+    assert sorted(started, key=str) == sorted(finished, key=str)
+    for event in recorder.events:
+        if event.event == "end":
+            assert event.wall >= 0 and event.cpu >= 0
+            assert event.allocated is None and event.peak is None
+    with open(output_file) as f:
+        assert "class User" in f.read()
+
+
+def test_app_without_observers_is_unchanged():
+    raw_text = read_fixture()
+    assert App(observers=[Recorder()]).process(raw_text, "sa") == App().process(
+        raw_text, "sa"
+    )
+
+
+def test_nested_stage_peak_memory():
+    recorder = Recorder()
+    instrumentation = Instrumentation([recorder])
+    tracemalloc.start()
+    try:
+        with instrumentation.stage("write"):
+            with instrumentation.stage("print", "User"):
+                data = bytearray(1024 * 1024)
+                del data
+    finally:
+        tracemalloc.stop()
+    inner, outer = [e for e in recorder.events if e.event == "end"]
+    assert inner.peak >= 1024 * 1024
+    assert outer.peak >= inner.peak
+    assert inner.allocated < 1024 * 1024
+
+
+def test_json_lines_exporter():
+    stream = io.StringIO()
+    app = App(observers=[JsonLinesExporter(stream)])
+    app.process(read_fixture(), "sa", safe_mode=True)
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert events[0] == {
+        "event": "start",
+        "stage": "detect",
+        "model": None,
+        "timestamp": events[0]["timestamp"],
+        "wall": None,
+        "cpu": None,
+        "allocated": None,
+        "peak": None,
+    }
+    assert {e["stage"] for e in events} == {
+        "detect",
+        "import",
+        "retrieve",
+        "to_core",
+        "print",
+    }
@@ -0,0 +1,147 @@
+import datetime
+import io
+import json
+import os
+import subprocess
+import sys
+from decimal import Decimal
+
+import pytest
+
+from app import App
+from conftest import payment_core_model, user_core_model
+from core import ir
+from core.db_primitives import CoreField, CoreModel
+from core.ir import IRError, dump_ir, load_ir, read_ir, write_ir
+
+
+def field_state(field):
+    return {name: getattr(field, name) for name in CoreField.__slots__}
+
+
+def model_state(model):
+    return (
+        model.tablename,
+        model.name,
+        model.doc,
+        tuple(model.unique_together),
+        [field_state(field) for field in model.fields],
+    )
+
+
+def test_ir_round_trip(tmp_path):
+    path = str(tmp_path / "schema.ir")
+    assert write_ir(path, [user_core_model, payment_core_model]) == 2
+    schema = read_ir(path)
+    assert [model_state(model) for model in schema] == [
+        model_state(user_core_model),
+        model_state(payment_core_model),
+    ]
+
+
+def test_ir_tagged_values():
+    model = CoreModel(
+        "event",
+        [
+            CoreField(sql_type=Decimal, name="price", default=Decimal("1.10")),
+            CoreField(sql_type=bytes, name="blob", default=b"\x00\xff"),
+            CoreField(
+                sql_type=datetime.datetime,
+                name="created",
+                default=datetime.datetime(2021, 1, 2, 3, 4, 5),
+            ),
+            CoreField(
+                sql_type=datetime.datetime,
+                name="touched",
+                default=datetime.datetime.now,
+            ),
+        ],
+    )
+    stream = io.BytesIO()
+    dump_ir([model], stream)
+    lines = stream.getvalue().splitlines()
+    assert json.loads(lines[0]) == {"format": "ormc-ir", "version": 1}
+    assert json.loads(lines[1])["fields"][0] == {
+        "name": "price",
+        "type": "decimal",
+        "default": {"$decimal": "1.10"},
+    }
+    stream.seek(0)
+    (loaded,) = load_ir(stream)
+    assert [field.default for field in loaded.fields] == [
+        Decimal("1.10"),
+        b"\x00\xff",
+        datetime.datetime(2021, 1, 2, 3, 4, 5),
+        None,
+    ]
+    assert loaded.fields[3].auto_on_create
+
+
+def test_ir_drops_other_callable_defaults():
+    model = CoreModel("event", [CoreField(sql_type=int, name="seq", default=len)])
+    with pytest.warns(RuntimeWarning):
+        dump_ir([model], io.BytesIO())
+
+
+def test_ir_never_imports(monkeypatch):
+    monkeypatch.delitem(sys.modules, "this", raising=False)
+    stream = io.BytesIO(
+        b'{"format":"ormc-ir","version":1}\n'
+        b'{"table":"user","fields":[{"name":"id","type":"int",'
+        b'"default":{"$callable":"this:s"}}]}\n'
+    )
+    with pytest.raises(IRError):
+        list(load_ir(stream))
+    assert "this" not in sys.modules
+
+
+def test_ir_rejects_other_versions():
+    stream = io.BytesIO(b'{"format":"ormc-ir","version":99}\n')
+    with pytest.raises(IRError):
+        list(load_ir(stream))
+    with pytest.raises(IRError):
+        list(load_ir(io.BytesIO(b'{"table":"user"}\n')))
+
+
+def test_ir_msgpack_round_trip():
+    pytest.importorskip("msgpack")
+    stream = io.BytesIO()
+    dump_ir([user_core_model], stream, ir.MSGPACK)
+    stream.seek(0)
+    assert [model_state(model) for model in load_ir(stream)] == [
+        model_state(user_core_model)
+    ]
+
+
+@pytest.mark.parametrize("safe_mode", [True, False])
+@pytest.mark.parametrize("fixture", ["django_start.py", "sa_start.py"])
+def test_print_from_ir_matches_conversion(tmp_path, fixture, safe_mode):
+    with open(f"fixtures/{fixture}") as f:
+        raw_text = f.read()
+    app = App()
+    path = str(tmp_path / "schema.ir")
+    write_ir(path, app.extract(raw_text, safe_mode=safe_mode))
+    for orm in ("sa", "django"):
+        printed = "".join(app.print_core_models(read_ir(path), orm))
+        assert printed == app.process(raw_text, orm, safe_mode=safe_mode)
+
+
+def test_print_from_ir_imports_no_orm(tmp_path):
+    script = (
+        "import sys\n"
+        "from app import App\n"
+        "from core.db_primitives import CoreField, CoreModel\n"
+        "model = CoreModel('user', [CoreField(int, 'id', primary_key=True)])\n"
+        "for orm in ('sa', 'django'):\n"
+        "    ''.join(App().print_core_models([model], orm))\n"
+        "print(sorted({name.split('.')[0] for name in sys.modules}"
+        " & {'sqlalchemy', 'django'}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert output.strip() == "[]"
@@ -6,11 +6,87 @@ def test_printers():
         SaSetupFixture,
         DjangoSetupFixture,
     ):
-        sa_model_user = setup.combine().from_core_model(user_core_model)
-        sa_model_payment = setup.combine().from_core_model(payment_core_model)
+        combine = setup.combine()
+        sa_model_user = combine.from_core_model(user_core_model)
+        sa_model_payment = combine.from_core_model(payment_core_model)
         user_printer = setup.model_printer(sa_model_user)
         payment_printer = setup.model_printer(sa_model_payment)
         assert user_printer.print_model() and payment_printer.print_model()
         module_printer = setup.module_printer(user_printer, payment_printer)
         module_repr = module_printer.print_module()
         assert module_repr
+        combine.dispose()
+
+
+def test_django_set_up_once(monkeypatch):
+    import django
+
+    setup_calls = []
+    monkeypatch.setattr(django, "setup", lambda: setup_calls.append(1))
+
+    combine = DjangoSetupFixture.combine()
+    models = [combine.from_core_model(user_core_model)]
+    printers = [DjangoSetupFixture.model_printer(model) for model in models * 50]
+    DjangoSetupFixture.combine()
+
+    assert all(printer.fields for printer in printers)
+    assert setup_calls == []
+
+
+class SaCoreSetupFixture(SaSetupFixture):
+    core_model_printer = SqlAlchemyCoreModelPrinter
+
+
+class DjangoCoreSetupFixture(DjangoSetupFixture):
+    core_model_printer = DjangoCoreModelPrinter
+
+
+def test_core_model_printers_match_orm_printers():
+    for setup in (SaCoreSetupFixture, DjangoCoreSetupFixture):
+        combine = setup.combine()
+        for core_model in (user_core_model, payment_core_model):
+            orm_printer = setup.model_printer(combine.from_core_model(core_model))
+            core_printer = setup.core_model_printer(core_model)
+            assert core_printer.print_model() == orm_printer.print_model()
+            assert core_printer.get_import_types() == orm_printer.get_import_types()
+        combine.dispose()
+
+
+def test_sa_core_model_printer():
+    user_printer = SaCoreSetupFixture.core_model_printer(user_core_model)
+    payment_printer = SaCoreSetupFixture.core_model_printer(payment_core_model)
+    user_repr = user_printer.print_model()
+    payment_repr = payment_printer.print_model()
+
+    assert 'class User(SABase):\n    """Some User Model"""' in user_repr
+    assert "__table_args__ = (UniqueConstraint('level', 'coeff'),)" in user_repr
+    assert "nickname = Column(String(length=32), unique=True, doc='Nickname')" in user_repr
+    assert (
+        "birthday = Column(Date(), default=datetime.datetime.utcnow, "
+        "onupdate=datetime.datetime.utcnow)" in user_repr
+    )
+    assert "balance = Column(DECIMAL(precision=2, scale=10))" in user_repr
+    assert (
+        "user_id = Column(Integer(), ForeignKey(User.id), nullable=False, doc='UserId')"
+        in payment_repr
+    )
+    assert SaCoreSetupFixture.module_printer(user_printer, payment_printer).print_module()
+
+
+def test_module_printer_streams_models():
+    import io
+
+    for setup in (SaCoreSetupFixture, DjangoCoreSetupFixture):
+        printers = [
+            setup.core_model_printer(model)
+            for model in (user_core_model, payment_core_model)
+        ]
+        module_printer = setup.module_printer(*printers)
+        chunks = list(module_printer.iter_module())
+        assert len(chunks) == 3
+        assert "".join(chunks) == module_printer.print_module()
+
+        stream = io.StringIO()
+        setup.module_printer(*printers).write_module(stream)
+        assert stream.getvalue() == "".join(chunks)
+
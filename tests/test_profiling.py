@@ -0,0 +1,36 @@
+from app import App
+from user_interfaces.profiling import StageTotals, profile
+
+
+def test_profile_conversion(tmp_path):
+    with open("fixtures/sa_start.py") as f:
+        raw_text = f.read()
+    stages = StageTotals()
+    app = App(observers=[stages])
+    output_file = str(tmp_path / "out.py")
+
+    paths = profile(
+        lambda: app.process_to_file(raw_text, "django", output_file, safe_mode=True),
+        stages,
+        str(tmp_path / "out.profile"),
+    )
+
+    assert [path.rsplit(".", 1)[1] for path in paths] == ["txt", "prof", "collapsed"]
+    assert set(stages.stages) == {
+        "detect",
+        "import",
+        "retrieve",
+        "to_core",
+        "print",
+        "format",
+        "write",
+    }
+    assert stages.stages["to_core"]["count"] == 2
+    assert all(totals["peak"] > 0 for totals in stages.stages.values())
+    with open(paths[0]) as f:
+        report = f.read()
+    assert "Hot functions by own time" in report and "to_core" in report
+    with open(paths[2]) as f:
+        for line in f:
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0 and stack
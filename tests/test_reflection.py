@@ -0,0 +1,108 @@
+import sqlite3
+from decimal import Decimal
+
+import pytest
+
+from app import App
+from orms_tools.sqlalchemy_tools.sa_reflection import reflect_database
+
+SCHEMA = """
+CREATE TABLE user (
+    id INTEGER NOT NULL PRIMARY KEY,
+    nickname VARCHAR(20) NOT NULL UNIQUE,
+    level INTEGER NOT NULL DEFAULT 1,
+    is_active BOOLEAN NOT NULL DEFAULT 1,
+    balance NUMERIC(10, 2),
+    signature BLOB,
+    reg_time DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (level, balance)
+);
+CREATE TABLE payment (
+    id INTEGER NOT NULL PRIMARY KEY,
+    sum NUMERIC NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES user (id)
+);
+CREATE TABLE audit_log (id INTEGER PRIMARY KEY, note TEXT DEFAULT 'none');
+"""
+
+
+def make_database(tmp_path) -> str:
+    path = tmp_path / "legacy.db"
+    with sqlite3.connect(path) as connection:
+        connection.executescript(SCHEMA)
+    return f"sqlite:///{path}"
+
+
+def test_reflect_sqlite(tmp_path):
+    schema = reflect_database(make_database(tmp_path))
+    assert [model.tablename for model in schema] == ["audit_log", "payment", "user"]
+
+    user = schema.get_model("user")
+    assert user.id.primary_key and not user.id.nullable
+    assert user.nickname.sql_type is str and user.nickname.length == 20
+    assert user.nickname.unique and not user.nickname.nullable
+    assert user.level.default == 1
+    assert user.is_active.sql_type is bool and user.is_active.default is True
+    assert user.balance.sql_type is Decimal
+    assert (user.balance.precision, user.balance.scale) == (2, 10)
+    assert user.signature.sql_type is bytes
+    assert user.reg_time.auto_on_create and user.reg_time.default is None
+    assert user.unique_together == (("level", "balance"),)
+
+    payment = schema.get_model("payment")
+    assert payment.user_id.foreign_key == "User.id"
+    assert schema.resolve_foreign_key(payment.user_id) == (user, user.id)
+    assert schema.get_model("audit_log").note.default == "none"
+
+
+def test_reflect_table_filter(tmp_path):
+    schema = reflect_database(make_database(tmp_path), tables=["pay*", "user"])
+    assert [model.tablename for model in schema] == ["payment", "user"]
+
+
+def test_print_reflected_models(tmp_path):
+    schema = reflect_database(make_database(tmp_path))
+    module = "".join(App().print_core_models(schema, "django"))
+    assert "class Payment(Model):" in module
+    assert "DecimalField(max_digits=10, decimal_places=2)" in module
+    compile(module, "reflected.py", "exec")
+
+
+def test_bulk_sqlite_reflection_matches_inspector(tmp_path):
+    import sqlalchemy as sa
+
+    from core.ir import model_to_record
+    from orms_tools.sqlalchemy_tools.sa_reflection import SQLAlchemyReflectionCombine
+
+    engine = sa.create_engine(make_database(tmp_path))
+    combine = SQLAlchemyReflectionCombine(engine, tables=["payment", "audit_log"])
+    inspector = sa.inspect(engine)
+    names = combine.table_names(inspector)
+    bulk = combine.reflect_sqlite(names)
+    each = list(combine.reflect_each(inspector, names))
+    assert [model_to_record(combine.to_core_model(table)) for table in bulk] == [
+        model_to_record(combine.to_core_model(table)) for table in each
+    ]
+    engine.dispose()
+
+
+def test_reflect_missing_sqlite_database(tmp_path):
+    path = tmp_path / "missing.db"
+    with pytest.raises(FileNotFoundError):
+        reflect_database(f"sqlite:///{path}")
+    assert not path.exists()
+
+
+def test_sqlite_column_type_without_private_affinity():
+    import sqlalchemy as sa
+    from sqlalchemy.dialects import sqlite
+
+    from orms_tools.sqlalchemy_tools.sa_reflection import SQLAlchemyReflectionCombine
+
+    class Dialect(sqlite.dialect):
+        _resolve_type_affinity = None
+
+    column_type = SQLAlchemyReflectionCombine.sqlite_column_type
+    assert isinstance(column_type(Dialect(), "VARCHAR(20)"), sa.VARCHAR)
+    assert isinstance(column_type(Dialect(), "WEIRD"), sa.types.NullType)
+    assert column_type(sqlite.dialect(), "VARCHAR(20)").length == 20
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from core.registry import BackendRegistry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ORMS = ("django", "sqlalchemy")
+
+
+def imported_after(code):
+    """Run code in fresh interpreter, return ORMs it imported."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys\n{code}\nprint(*[m for m in {ORMS!r} if m in sys.modules])",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.split()
+
+
+def test_import_ormcombine_imports_no_orm():
+    assert imported_after("import ormcombine") == []
+
+
+def test_registry_imports_only_requested_orm():
+    assert imported_after(
+        "from orms_tools import combines, model_printers\n"
+        "combines['sa']\n"
+        "model_printers['sa']"
+    ) == ["sqlalchemy"]
+    assert imported_after(
+        "from orms_tools import ast_combines\nast_combines['django']"
+    ) == []
+
+
+def test_registry_discovers_entry_points(tmp_path, monkeypatch):
+    dist_info = tmp_path / "ormc_fake-0.1.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Name: ormc-fake\nVersion: 0.1\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[ormc.test_combines]\nfake = collections:OrderedDict\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    registry = BackendRegistry("ormc.test_combines", {"sa": "collections:Counter"})
+    assert "fake" in registry
+    assert sorted(registry) == ["fake", "sa"]
+    assert registry["fake"].__name__ == "OrderedDict"
+
+    with pytest.raises(KeyError):
+        registry["tortoise"]
@@ -0,0 +1,20 @@
+import os
+import stat
+
+from core.utils import write_output
+
+
+def test_write_output_keeps_file_mode(tmp_path):
+    def mode(path):
+        return stat.S_IMODE(os.stat(path).st_mode)
+
+    umask = os.umask(0o022)
+    try:
+        path = str(tmp_path / "output.py")
+        write_output(path, ["a = 1\n"])
+        assert mode(path) == 0o644
+        os.chmod(path, 0o640)
+        write_output(path, ["a = 2\n"])
+        assert mode(path) == 0o640
+    finally:
+        os.umask(umask)
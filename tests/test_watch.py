@@ -0,0 +1,67 @@
+import shutil
+import sys
+
+import pytest
+
+from user_interfaces.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    rebuild,
+    wait_for_changes,
+    watched_inputs,
+)
+from user_interfaces.batch import init_worker
+
+
+def touch(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_polling_watcher(tmp_path):
+    path = str(tmp_path / "models.py")
+    touch(path, "a")
+    watcher = PollingWatcher([path], interval=0.01)
+    assert watcher.poll(0.05) == set()
+    touch(path, "changed")
+    assert watcher.poll(0.5) == {path}
+    assert watcher.poll(0.05) == set()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+def test_inotify_watcher_debounces_changes(tmp_path):
+    first, second = str(tmp_path / "a.py"), str(tmp_path / "b.py")
+    watcher = InotifyWatcher([str(tmp_path)])
+    try:
+        touch(first, "a")
+        touch(second, "b")
+        assert wait_for_changes(watcher, 0.05) == {first, second}
+        assert watcher.poll(0.05) == set()
+    finally:
+        watcher.close()
+
+
+def test_rebuild_converts_given_inputs(tmp_path):
+    input_file = str(tmp_path / "models.py")
+    shutil.copy("fixtures/sa_start.py", input_file)
+    output_file = str(tmp_path / "models_django.py")
+    init_worker("django", fragments_dir=str(tmp_path / "fragments"))
+
+    assert rebuild([input_file], {input_file: output_file}, "django", True) == {}
+    assert "class User(Model)" in open(output_file).read()
+
+    touch(input_file, "nothing to see here\n")
+    assert input_file in rebuild(
+        [input_file], {input_file: output_file}, "django", True
+    )
+
+
+def test_watched_inputs_skip_outputs(tmp_path):
+    for name in ("models.py", "models_sa.py", "stale_sa.py"):
+        touch(str(tmp_path / name), "")
+    inputs = [str(tmp_path)]
+    input_files, outputs = watched_inputs(
+        inputs, "sa", pattern="*.py", known_outputs=[str(tmp_path / "stale_sa.py")]
+    )
+    assert input_files == [str(tmp_path / "models.py")]
+    assert outputs == {input_files[0]: str(tmp_path / "models_sa.py")}
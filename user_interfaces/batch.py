@@ -0,0 +1,166 @@
+import fnmatch
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app import App
+from core.cache import DEFAULT_CACHE_SIZE, ConversionCache
+from core.const import SUPPORTED_ORMS
+from core.formatting import load_black
+from core.incremental import FragmentStore
+from orms_tools import ast_combines, combines, core_model_printers, module_printers
+
+worker_app: Optional[App] = None
+worker_format_outputs = False
+
+
+def is_batch(inputs: List[str]) -> bool:
+    """Check inputs need batch conversion rather than single file one."""
+    return len(inputs) > 1 or any(
+        os.path.isdir(path) or glob.has_magic(path) for path in inputs
+    )
+
+
+def collect_input_files(inputs: List[str], pattern: str = "models.py") -> List[str]:
+    """Expand files, directories and glob patterns into list of input files."""
+    files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend(
+                    os.path.join(root, name)
+                    for name in sorted(names)
+                    if fnmatch.fnmatch(name, pattern)
+                )
+        elif glob.has_magic(path):
+            files.extend(sorted(glob.glob(path, recursive=True)))
+        else:
+            files.append(path)
+    return list(dict.fromkeys(os.path.normpath(file) for file in files))
+
+
+def output_paths(
+    input_files: List[str], to_orm: str, output_dir: Optional[str] = None
+) -> Dict[str, str]:
+    """Map input files to output files.
+
+    Outputs go next to inputs as `<name>_<orm>.py` (`.sql` for DDL), or keep their
+    names in a tree under `output_dir` mirroring the inputs' common directory.
+    """
+    suffix = App.output_suffix(to_orm)
+    if not output_dir:
+        return {
+            path: f"{os.path.splitext(path)[0]}_{to_orm}{suffix}"
+            for path in input_files
+        }
+    base = os.path.commonpath(
+        [os.path.dirname(os.path.abspath(path)) for path in input_files]
+    )
+    return {
+        path: os.path.splitext(
+            os.path.join(output_dir, os.path.relpath(os.path.abspath(path), base))
+        )[0]
+        + suffix
+        for path in input_files
+    }
+
+
+def warm_up():
+    """Import every supported ORM backend and set Django up once, for long-running processes."""
+    for orm in SUPPORTED_ORMS:
+        ast_combines[orm]
+        combines[orm]().dispose()
+        core_model_printers[orm]
+        module_printers[orm]
+
+
+def init_worker(
+    to_orm: str,
+    cache_dir: Optional[str] = None,
+    cache_size=DEFAULT_CACHE_SIZE,
+    fragments_dir: Optional[str] = None,
+    format_outputs=False,
+):
+    """Warm up worker process: build App and import output backends and black once."""
+    global worker_app, worker_format_outputs
+    cache = ConversionCache(cache_dir, cache_size) if cache_dir else None
+    fragments = FragmentStore(fragments_dir) if fragments_dir else None
+    worker_app = App(cache=cache, fragments=fragments)
+    core_model_printers[to_orm]
+    module_printers[to_orm]
+    worker_format_outputs = format_outputs
+    if format_outputs:
+        load_black()
+
+
+def convert_file(
+    job: Tuple[str, str, str, bool, bool]
+) -> Tuple[str, Optional[str], bool]:
+    """Convert one file in worker, return (input file, error or None, cache hit)."""
+    input_file, output_file, to_orm, safe_mode, verify = job
+    cache = worker_app.cache
+    hits = cache.hits if cache else 0
+    try:
+        with open(input_file) as input_file_reader:
+            raw_text = input_file_reader.read()
+        worker_app.process_to_file(
+            raw_text,
+            to_orm,
+            output_file,
+            safe_mode=safe_mode,
+            verify=verify,
+            format_output=worker_format_outputs,
+        )
+    except (Exception, SystemExit) as ex:
+        return input_file, f"{ex.__class__.__name__}: {ex}", False
+    return input_file, None, bool(cache and cache.hits > hits)
+
+
+def convert_batch(
+    inputs: List[str],
+    to_orm: str,
+    output_dir: Optional[str] = None,
+    jobs: Optional[int] = None,
+    safe_mode=False,
+    verify=False,
+    pattern: str = "models.py",
+    format_outputs=True,
+    cache_dir: Optional[str] = None,
+    cache_size=DEFAULT_CACHE_SIZE,
+    fragments_dir: Optional[str] = None,
+) -> Dict[str, str]:
+    """Convert many files with pool of warm workers, return failures by input file.
+
+    Outputs are cached in `cache_dir` and printed models in `fragments_dir` when given.
+    Workers format outputs with black in-process before writing them.
+    """
+    input_files = collect_input_files(inputs, pattern)
+    if not input_files:
+        print("No input files found")
+        return {}
+    outputs = output_paths(input_files, to_orm, output_dir)
+    work = [(path, outputs[path], to_orm, safe_mode, verify) for path in input_files]
+
+    if jobs == 1:
+        init_worker(to_orm, cache_dir, cache_size, fragments_dir, format_outputs)
+        results = list(map(convert_file, work))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=init_worker,
+            initargs=(to_orm, cache_dir, cache_size, fragments_dir, format_outputs),
+        ) as executor:
+            results = list(executor.map(convert_file, work))
+
+    failures = {path: error for path, error, _ in results if error}
+    converted = [outputs[path] for path, error, _ in results if not error]
+
+    print(f"Converted {len(converted)} of {len(input_files)} files")
+    if cache_dir:
+        hits = sum(hit for _, _, hit in results)
+        print(f"Cache: {hits} hits, {len(results) - hits} misses")
+    for path, error in failures.items():
+        print(f"Failed {path}: {error}")
+    return failures
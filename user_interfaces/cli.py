@@ -1,46 +1,373 @@
 import argparse
 import os
+import tracemalloc
+from typing import Optional
 
 from app import App
-from core.const import SUPPORTED_ORMS
+from core.cache import DEFAULT_CACHE_SIZE, ConversionCache, default_cache_dir
+from core.db_primitives import CoreSchema
+from core.const import DDL_TARGETS, SUPPORTED_ORMS
+from core.incremental import FragmentStore
+from core.instrumentation import JsonLinesExporter
+from core.utils import write_output
+from user_interfaces.batch import convert_batch, is_batch
+from user_interfaces.watch import watch
+
+
+def output_path(output: Optional[str], to_orm: str) -> str:
+    """Output file name with suffix of target, `output.py` or `output.sql` by default"""
+    suffix = App.output_suffix(to_orm)
+    if not output:
+        return f"output{suffix}"
+    return output if output.endswith(suffix[1:]) else f"{output}{suffix}"
+
+
+def load_schema(source: str, safe_mode=False) -> CoreSchema:
+    """Core models of database URL, IR file or models module"""
+    if "://" in source:
+        from orms_tools.sqlalchemy_tools.sa_reflection import reflect_database
+
+        return reflect_database(source)
+    if not source.endswith(".py"):
+        from core.ir import read_ir
+
+        return read_ir(source)
+    with open(source) as input_file_reader:
+        return App().extract(input_file_reader.read(), safe_mode)
 
 
 def cli():
     parser = argparse.ArgumentParser(description="ORM Combine")
     parser.add_argument(
-        "--input", "-i", type=str, help="Input file with models to convert"
+        "--input",
+        "-i",
+        type=str,
+        nargs="+",
+        help="Input file with models to convert, or many files, directories and globs",
     )
     parser.add_argument(
         "--to",
         "-t",
         type=str,
-        help=f"Output ORM name (one of :{[i for i in SUPPORTED_ORMS]}",
+        help=f"Output ORM name or DDL dialect "
+        f"(one of :{[i for i in SUPPORTED_ORMS + DDL_TARGETS]}",
     )
     parser.add_argument(
         "--output",
         "-o",
         type=str,
-        default="output.py",
-        help="Output file name",
+        help="Output file name (default: output.py, output.sql for DDL)",
         required=False,
     )
+    parser.add_argument(
+        "--safe-mode",
+        action="store_true",
+        help="Read models from source without executing input file",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Also build real ORM classes and print them by introspection, "
+        "warn if outputs differ (slow)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        help="Write batch outputs into this directory mirroring input tree "
+        "(default: next to inputs as <name>_<orm>.py)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="Number of worker processes for batch conversion (default: CPU count)",
+    )
+    parser.add_argument(
+        "--pattern",
+        type=str,
+        default="models.py",
+        help="File name pattern to search in input directories",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always convert, do not read or write cached outputs",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help=f"Conversion cache directory (default: {default_cache_dir()})",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help="Maximum number of cached conversions, least recently used are evicted",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Store printed models and convert only models changed since last run "
+        "(and models depending on them)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and convert inputs again whenever they change (incremental)",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.2,
+        help="Seconds without changes to wait before converting in watch mode",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run warm conversion daemon on Unix socket",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Convert in running daemon, in this process if there is none",
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        help="Daemon Unix socket path (default: $XDG_RUNTIME_DIR/ormc-<uid>.sock)",
+    )
+    parser.add_argument(
+        "--events",
+        type=str,
+        help="Append conversion stage events to file as JSON lines",
+    )
+    parser.add_argument(
+        "--events-memory",
+        action="store_true",
+        help="Trace memory to report allocated and peak bytes in --events, "
+        "conversion gets slower",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        nargs="?",
+        const="",
+        help="Profile conversion of single file in-process, write reports to PREFIX"
+        ".txt/.prof/.collapsed (default: output file name with .profile)",
+    )
+
+    parser.add_argument(
+        "--emit-ir",
+        type=str,
+        metavar="PATH",
+        help="Store core models of input as IR file (JSON lines, msgpack for .msgpack)",
+    )
+    parser.add_argument(
+        "--from-ir",
+        type=str,
+        metavar="PATH",
+        help="Read core models from IR file instead of input, no ORM module is imported",
+    )
+    parser.add_argument(
+        "--from-db",
+        type=str,
+        metavar="URL",
+        help="Reflect tables of existing database instead of input, "
+        "e.g. sqlite:///legacy.db",
+    )
+    parser.add_argument(
+        "--db-schema",
+        type=str,
+        help="Database schema to reflect with --from-db (default: default schema)",
+    )
+    parser.add_argument(
+        "--db-tables",
+        type=str,
+        nargs="+",
+        metavar="PATTERN",
+        help="Reflect only tables matching these patterns with --from-db",
+    )
+    parser.add_argument(
+        "--diff",
+        type=str,
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="Print operations turning OLD schema into NEW one, each a models file, "
+        "IR file or database URL; exits with 1 when they differ",
+    )
 
     args = parser.parse_args()
-    input_file = args.input
+    if args.events_memory and not args.events:
+        parser.error("--events-memory needs --events")
+    if args.profile is not None and (
+        args.input is None
+        or args.serve
+        or args.daemon
+        or args.watch
+        or args.output_dir
+        or is_batch(args.input)
+    ):
+        parser.error("--profile converts one input file in this process")
+
+    if args.serve:
+        from user_interfaces.daemon import ConversionDaemon
+
+        cache = (
+            None if args.no_cache else ConversionCache(args.cache_dir, args.cache_size)
+        )
+        ConversionDaemon(args.socket, App(cache=cache)).run()
+        return
+
+    if args.diff:
+        from core.diff import diff_schemas
+
+        old, new = (load_schema(source, args.safe_mode) for source in args.diff)
+        changed = False
+        for operation in diff_schemas(old, new):
+            print(operation)
+            changed = True
+        exit(1 if changed else 0)
+
+    core_models = None
+    if args.from_ir:
+        from core.ir import read_ir
+
+        core_models = read_ir(args.from_ir)
+    elif args.from_db:
+        from orms_tools.sqlalchemy_tools.sa_reflection import reflect_database
+
+        core_models = reflect_database(
+            args.from_db, schema=args.db_schema, tables=args.db_tables
+        )
+
+    if args.emit_ir:
+        from core.ir import write_ir
+
+        if core_models is None:
+            if args.input is None:
+                parser.error("--emit-ir requires -i")
+            if is_batch(args.input):
+                parser.error("--emit-ir stores models of one input file")
+            with open(args.input[0]) as input_file_reader:
+                raw_text = input_file_reader.read()
+            core_models = App().extract(raw_text, args.safe_mode)
+        count = write_ir(args.emit_ir, core_models)
+        print(f"{count} models written to {args.emit_ir}")
+        return
+
+    if args.verify and args.to in DDL_TARGETS:
+        parser.error("--verify needs ORM output, DDL is printed from core models only")
+
+    if core_models is not None:
+        output_file = output_path(args.output, args.to)
+        app = App()
+        app.write(
+            output_file,
+            app.print_core_models(core_models, args.to),
+            App.output_suffix(args.to) == ".py",
+        )
+        return
+
+    if args.daemon and not is_batch(args.input):
+        from user_interfaces import client
+
+        with open(args.input[0]) as input_file_reader:
+            raw_text = input_file_reader.read()
+        output_file = output_path(args.output, args.to)
+        result = client.convert(
+            raw_text,
+            args.to,
+            safe_mode=args.safe_mode,
+            verify=args.verify,
+            socket_path=args.socket,
+        )
+        write_output(output_file, [result])
+        return
+
     to_orm = args.to
+    cache_dir = None if args.no_cache else args.cache_dir or default_cache_dir()
+    fragments_dir = None
+    if args.incremental or args.watch:
+        fragments_dir = os.path.join(args.cache_dir or default_cache_dir(), "fragments")
+
+    output_file = output_path(args.output, to_orm)
 
-    output_file = args.output
+    if args.watch:
+        watch(
+            args.input,
+            to_orm,
+            output=None if args.output_dir else output_file,
+            output_dir=args.output_dir,
+            safe_mode=args.safe_mode,
+            pattern=args.pattern,
+            debounce=args.debounce,
+            cache_dir=cache_dir,
+            cache_size=args.cache_size,
+            fragments_dir=fragments_dir,
+        )
+        return
 
-    if not output_file.endswith("py"):
-        output_file += ".py"
+    if is_batch(args.input) or args.output_dir:
+        failures = convert_batch(
+            args.input,
+            to_orm,
+            output_dir=args.output_dir,
+            jobs=args.jobs,
+            safe_mode=args.safe_mode,
+            verify=args.verify,
+            pattern=args.pattern,
+            cache_dir=cache_dir,
+            cache_size=args.cache_size,
+            fragments_dir=fragments_dir,
+        )
+        exit(1 if failures else 0)
 
-    app = App()
+    input_file = args.input[0]
+
+    if args.profile is not None:
+        # cached output would leave nothing to profile
+        cache_dir = None
+    cache = ConversionCache(cache_dir, args.cache_size) if cache_dir else None
+    fragments = FragmentStore(fragments_dir) if fragments_dir else None
+    observers = []
+    exporter = JsonLinesExporter.open(args.events) if args.events else None
+    if exporter:
+        observers.append(exporter)
+    if args.profile is not None:
+        from user_interfaces.profiling import StageTotals
+
+        stage_totals = StageTotals()
+        observers.append(stage_totals)
+    app = App(cache=cache, fragments=fragments, observers=observers)
     with open(f"{input_file}") as input_file_reader:
         raw_text = input_file_reader.read()
-    result = app.process(raw_text, to_orm)
-    with open(f"{output_file}", "w") as f:
-        f.write(result)
-    os.system(f"python -m black {output_file}")
+
+    def run():
+        app.process_to_file(
+            raw_text, to_orm, output_file, safe_mode=args.safe_mode, verify=args.verify
+        )
+
+    if args.events_memory:
+        tracemalloc.start()
+    try:
+        if args.profile is not None:
+            from user_interfaces.profiling import profile
+
+            prefix = args.profile or f"{os.path.splitext(output_file)[0]}.profile"
+            paths = profile(run, stage_totals, prefix)
+            print(stage_totals.report())
+            print(f"Profile written to {', '.join(paths)}")
+        else:
+            run()
+    finally:
+        if args.events_memory:
+            tracemalloc.stop()
+        if exporter:
+            exporter.close()
+    if cache and not args.verify:
+        print(cache.stats())
+    if fragments and not args.verify and fragments.hits + fragments.misses:
+        print(f"Models: {fragments.hits} reused, {fragments.misses} converted")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+import json
+import os
+import socket
+import tempfile
+from typing import Dict, Optional
+
+
+class ConversionError(Exception):
+    """Conversion failed in daemon."""
+
+
+def default_socket_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"ormc-{os.getuid()}.sock")
+
+
+def request(message: Dict, socket_path: Optional[str] = None, timeout=60.0) -> Dict:
+    """Send one JSON line to daemon and read one back."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path or default_socket_path())
+        client.sendall(json.dumps(message).encode() + b"\n")
+        with client.makefile("rb") as response:
+            line = response.readline()
+    if not line:
+        raise ConnectionError("Daemon closed connection")
+    return json.loads(line)
+
+
+def convert_in_process(
+    source: str, to_orm: str, safe_mode=False, verify=False, format_output=True
+) -> str:
+    from app import App
+    from core.formatting import format_chunks
+
+    chunks = App().iter_process(source, to_orm, safe_mode=safe_mode, verify=verify)
+    if format_output and App.output_suffix(to_orm) == ".py":
+        chunks = format_chunks(chunks)
+    return "".join(chunks)
+
+
+def convert(
+    source: str,
+    to_orm: str,
+    safe_mode=False,
+    verify=False,
+    format_output=True,
+    socket_path: Optional[str] = None,
+) -> str:
+    """Convert source in running daemon, or in this process when there is none.
+
+    ORMs are imported only for in-process fallback, so talking to daemon stays cheap.
+    """
+    try:
+        response = request(
+            {
+                "source": source,
+                "to": to_orm,
+                "safe_mode": safe_mode,
+                "verify": verify,
+                "format": format_output,
+            },
+            socket_path,
+        )
+    except (FileNotFoundError, ConnectionRefusedError):
+        return convert_in_process(source, to_orm, safe_mode, verify, format_output)
+    if "error" in response:
+        raise ConversionError(response["error"])
+    return response["output"]
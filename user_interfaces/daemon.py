@@ -0,0 +1,111 @@
+import asyncio
+import json
+import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from app import App
+from core.formatting import format_chunks, load_black
+from user_interfaces.batch import warm_up
+from user_interfaces.client import default_socket_path
+
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+
+def is_listening(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+class ConversionDaemon:
+    """Warm process converting jobs sent over Unix socket as JSON lines.
+
+    Request is `{"source": ..., "to": ..., "safe_mode": ..., "verify": ..., "format": ...}`
+    and response is `{"output": ...}` or `{"error": ...}`. `{"command": "stop"}` stops daemon.
+    Jobs run one by one in a worker thread, so the loop keeps accepting connections.
+    """
+
+    socket_path: str
+    app: App
+
+    def __init__(self, socket_path: Optional[str] = None, app: Optional[App] = None):
+        self.socket_path = socket_path or default_socket_path()
+        self.app = app or App()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.stopped: Optional[asyncio.Event] = None
+
+    def convert(self, request: Dict) -> Dict:
+        try:
+            chunks = self.app.iter_process(
+                request["source"],
+                request["to"],
+                safe_mode=request.get("safe_mode", False),
+                verify=request.get("verify", False),
+            )
+            if (
+                request.get("format", True)
+                and App.output_suffix(request["to"]) == ".py"
+            ):
+                chunks = format_chunks(chunks)
+            return {"output": "".join(chunks)}
+        except (Exception, SystemExit) as ex:
+            return {"error": f"{ex.__class__.__name__}: {ex}"}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError as ex:
+                    response = {"error": f"Invalid request: {ex}"}
+                else:
+                    if request.get("command") == "stop":
+                        self.stopped.set()
+                        response = {"output": "stopped"}
+                    elif request.get("command") == "ping":
+                        response = {"output": "pong"}
+                    else:
+                        response = await loop.run_in_executor(
+                            self.executor, self.convert, request
+                        )
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self):
+        if os.path.exists(self.socket_path):
+            if is_listening(self.socket_path):
+                raise RuntimeError(f"Daemon already listens on {self.socket_path}")
+            os.remove(self.socket_path)
+        self.stopped = asyncio.Event()
+        server = await asyncio.start_unix_server(
+            self.handle, self.socket_path, limit=MAX_MESSAGE_SIZE
+        )
+        try:
+            async with server:
+                await self.stopped.wait()
+        finally:
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def run(self):
+        """Warm ORMs up and serve until stopped or interrupted."""
+        warm_up()
+        load_black()
+        print(f"Listening on {self.socket_path}")
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.executor.shutdown()
@@ -0,0 +1,133 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from core.instrumentation import StageEvent, StageObserver
+
+DEFAULT_SAMPLE_INTERVAL = 0.001
+HOT_FUNCTIONS = 40
+
+
+class StageTotals(StageObserver):
+    """Sum time and keep peak traced memory of every stage."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages: Dict[str, Dict] = {}
+
+    def stage_finished(self, event: StageEvent):
+        with self.lock:
+            totals = self.stages.setdefault(
+                event.stage, {"count": 0, "wall": 0.0, "cpu": 0.0, "peak": 0}
+            )
+            totals["count"] += 1
+            totals["wall"] += event.wall
+            totals["cpu"] += event.cpu
+            if event.peak is not None:
+                totals["peak"] = max(totals["peak"], event.peak)
+
+    def report(self) -> str:
+        lines = [
+            f"{'stage':<10} {'calls':>6} {'wall s':>9} {'cpu s':>9} {'peak MiB':>9}"
+        ]
+        for stage, totals in self.stages.items():
+            lines.append(
+                f"{stage:<10} {totals['count']:>6} {totals['wall']:>9.4f} "
+                f"{totals['cpu']:>9.4f} {totals['peak'] / 2 ** 20:>9.2f}"
+            )
+        return "\n".join(lines)
+
+
+@lru_cache(maxsize=None)
+def frame_label(code) -> str:
+    """`function (path:line)` with path shortened to its import location."""
+    filename = code.co_filename
+    for path in sorted(filter(None, sys.path), key=len, reverse=True):
+        if filename.startswith(path + os.sep):
+            filename = filename[len(path) + 1 :]
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Sample stacks of one thread from a background thread, for flame graphs.
+
+    cProfile only records callers one level up, so full stacks are sampled instead.
+    Samples are taken when the sampled thread releases GIL, at most every `interval`.
+    """
+
+    def __init__(
+        self, thread_id: Optional[int] = None, interval=DEFAULT_SAMPLE_INTERVAL
+    ):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+
+    def sample(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def write_collapsed(self, path: str):
+        """Write `frame;frame;frame count` lines, as read by flamegraph.pl and speedscope."""
+        with open(path, "w") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def write_hot_functions(profiler: cProfile.Profile, path: str, stage_report: str):
+    with open(path, "w") as f:
+        f.write("Stages\n\n" + stage_report + "\n\n")
+        stats = pstats.Stats(profiler, stream=f)
+        f.write("Hot functions by own time\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(HOT_FUNCTIONS)
+        f.write("Hot functions by cumulative time\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(HOT_FUNCTIONS)
+
+
+def profile(run: Callable[[], None], stages: StageTotals, prefix: str) -> List[str]:
+    """Run conversion under cProfile, tracemalloc and stack sampling.
+
+    `stages` has to observe the App used by `run`. Writes `<prefix>.txt` (stage
+    totals and hot functions), `<prefix>.prof` (pstats) and `<prefix>.collapsed`
+    (stacks for flame graphs), returns their paths.
+    """
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    sampler = StackSampler()
+    sampler.start()
+    profiler.enable()
+    try:
+        run()
+    finally:
+        profiler.disable()
+        sampler.stop()
+        if started_tracing:
+            tracemalloc.stop()
+    paths = [f"{prefix}.txt", f"{prefix}.prof", f"{prefix}.collapsed"]
+    write_hot_functions(profiler, paths[0], stages.report())
+    profiler.dump_stats(paths[1])
+    sampler.write_collapsed(paths[2])
+    return paths
@@ -0,0 +1,252 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core.cache import DEFAULT_CACHE_SIZE
+from user_interfaces.batch import (
+    collect_input_files,
+    convert_file,
+    init_worker,
+    is_batch,
+    output_paths,
+    warm_up,
+)
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Report changed files in watched directories using Linux inotify."""
+
+    def __init__(self, directories: Iterable[str]):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}
+        try:
+            for directory in directories:
+                self.add_directory(directory)
+        except OSError:
+            self.close()
+            raise
+
+    def add_directory(self, directory: str):
+        if directory in self.directories.values():
+            return
+        wd = self.libc.inotify_add_watch(
+            self.fd, os.fsencode(directory), ctypes.c_uint32(WATCH_MASK)
+        )
+        if wd < 0:
+            raise OSError(
+                ctypes.get_errno(), f"inotify_add_watch failed for {directory}"
+            )
+        self.directories[wd] = directory
+
+    def poll(self, timeout: Optional[float]) -> Set[str]:
+        """Paths changed within `timeout` seconds, wait forever if None"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, _, _, name_length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset : offset + name_length].rstrip(b"\0")
+                offset += name_length
+                if wd in self.directories and name:
+                    changed.add(
+                        os.path.normpath(
+                            os.path.join(self.directories[wd], os.fsdecode(name))
+                        )
+                    )
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """Report changed files by comparing modification times, where inotify is missing."""
+
+    def __init__(self, paths: Iterable[str], interval=0.5):
+        self.interval = interval
+        self.snapshot = {}
+        self.watch(paths)
+
+    @staticmethod
+    def stat(path: str):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def watch(self, paths: Iterable[str]):
+        for path in paths:
+            self.snapshot.setdefault(path, self.stat(path))
+
+    def poll(self, timeout: Optional[float]) -> Set[str]:
+        """Paths changed within `timeout` seconds, wait forever if None"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path, previous in self.snapshot.items():
+                current = self.stat(path)
+                if current != previous:
+                    self.snapshot[path] = current
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(deadline - time.monotonic(), 0))
+            time.sleep(delay)
+
+    def close(self):
+        pass
+
+
+def make_watcher(input_files: List[str], directories: Iterable[str]):
+    """Inotify watcher on Linux, polling one anywhere else."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directories)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(input_files)
+
+
+def wait_for_changes(watcher, debounce: float) -> Set[str]:
+    """Block till something changes, then collect changes until `debounce` seconds pass quietly."""
+    changed = watcher.poll(None)
+    while True:
+        more = watcher.poll(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+def watched_directories(inputs: List[str], input_files: List[str]) -> Set[str]:
+    directories = {os.path.dirname(os.path.abspath(path)) for path in input_files}
+    for path in inputs:
+        if os.path.isdir(path):
+            directories.update(os.path.abspath(root) for root, _, _ in os.walk(path))
+    return directories
+
+
+def watched_inputs(
+    inputs: List[str],
+    to_orm: str,
+    output: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    pattern: str = "models.py",
+    known_outputs: Iterable[str] = (),
+) -> Tuple[List[str], Dict[str, str]]:
+    """Input files and their outputs, outputs matching `pattern` are not inputs.
+
+    Outputs are written next to inputs by default, with a broad pattern they
+    would be converted again on every change.
+    """
+
+    def mapping(input_files):
+        if output and not is_batch(inputs):
+            return {path: output for path in input_files}
+        return output_paths(input_files, to_orm, output_dir)
+
+    input_files = collect_input_files(inputs, pattern)
+    outputs = {os.path.abspath(path) for path in known_outputs}
+    outputs.update(os.path.abspath(path) for path in mapping(input_files).values())
+    input_files = [path for path in input_files if os.path.abspath(path) not in outputs]
+    return input_files, mapping(input_files)
+
+
+def rebuild(
+    input_files: Iterable[str], outputs: Dict[str, str], to_orm: str, safe_mode=False
+) -> Dict[str, str]:
+    """Convert given inputs with warm worker App, return failures by input file."""
+    failures = {}
+    for input_file in input_files:
+        _, error, _ = convert_file(
+            (input_file, outputs[input_file], to_orm, safe_mode, False)
+        )
+        if error:
+            failures[input_file] = error
+    return failures
+
+
+def report(failures: Dict[str, str], input_files: List[str]):
+    print(f"Converted {len(input_files) - len(failures)} of {len(input_files)} files")
+    for path, error in failures.items():
+        print(f"Failed {path}: {error}")
+
+
+def watch(
+    inputs: List[str],
+    to_orm: str,
+    output: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    safe_mode=False,
+    pattern: str = "models.py",
+    debounce=0.2,
+    cache_dir: Optional[str] = None,
+    cache_size=DEFAULT_CACHE_SIZE,
+    fragments_dir: Optional[str] = None,
+):
+    """Keep converting inputs whenever they change, until interrupted."""
+
+    def output_mapping(known_outputs=()):
+        return watched_inputs(
+            inputs, to_orm, output, output_dir, pattern, known_outputs
+        )
+
+    warm_up()
+    init_worker(to_orm, cache_dir, cache_size, fragments_dir, format_outputs=True)
+
+    input_files, outputs = output_mapping()
+    report(rebuild(input_files, outputs, to_orm, safe_mode), input_files)
+    watcher = make_watcher(input_files, watched_directories(inputs, input_files))
+    print(f"Watching {len(input_files)} files, press Ctrl+C to stop")
+    try:
+        while True:
+            changed = wait_for_changes(watcher, debounce)
+            input_files, outputs = output_mapping(outputs.values())
+            if isinstance(watcher, PollingWatcher):
+                watcher.watch(input_files)
+            else:
+                for directory in watched_directories(inputs, input_files):
+                    watcher.add_directory(directory)
+            changed = {os.path.abspath(path) for path in changed}
+            changed_inputs = [
+                path for path in input_files if os.path.abspath(path) in changed
+            ]
+            if changed_inputs:
+                report(
+                    rebuild(changed_inputs, outputs, to_orm, safe_mode),
+                    changed_inputs,
+                )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()